@@ -2,64 +2,192 @@ import json
 import os
 import requests
 import boto3
-from urllib.parse import parse_qs
+from botocore.config import Config
+import logging
+import re
+from urllib.parse import parse_qsl, urlencode, quote
 import time
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
-from datetime import datetime, timedelta
-import pytz # KST 시간대 처리를 위해 pytz 라이브러리 추가
+from requests.packages.urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError, ReadTimeoutError, ResponseError
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError # KST 시간대 처리 (표준 라이브러리, pytz 의존성 제거)
 from datetime import date
+from math import fsum
+from collections import defaultdict, namedtuple
+import heapq
+from functools import lru_cache
+
+try:
+    import orjson  # 대용량 비용 응답의 JSON 파싱/직렬화 가속 (배포 패키지에 없으면 표준 json 사용)
+except ImportError:
+    orjson = None
+
+# 레벨은 이 모듈의 로거에만 적용 (루트 로거에 설정하면 LOG_LEVEL=DEBUG가 botocore/urllib3 디버그 로그까지 켜서 시크릿 응답 본문이 기록됨)
+logger = logging.getLogger(__name__)
+# 잘못된 LOG_LEVEL 값(예: 'verbose')으로 init이 실패하지 않도록 알려진 레벨만 적용하고 그 외에는 INFO 사용
+_LOG_LEVEL_NAME = (os.environ.get('LOG_LEVEL') or 'INFO').strip().upper()
+_LOG_LEVEL = logging.getLevelName(_LOG_LEVEL_NAME)  # 알 수 없는 이름이면 'Level ...' 문자열 반환
+if isinstance(_LOG_LEVEL, int):
+    logger.setLevel(_LOG_LEVEL)
+else:
+    logger.setLevel(logging.INFO)
+    logger.warning("⚠️ 알 수 없는 LOG_LEVEL '%s' - INFO로 설정합니다.", _LOG_LEVEL_NAME)
 
 # 환경 변수에서 FitCloud API 기본 URL 및 Secrets Manager 보안 암호 가져오기
 FITCLOUD_BASE_URL = os.environ.get('FITCLOUD_BASE_URL', 'https://aws-dev.fitcloud.co.kr/api/v1')
 SECRET_NAME = os.environ.get('FITCLOUD_API_SECRET_NAME', 'dev-FitCloud/ApiToken')
 
-# Secrets Manager 클라이언트 초기화
-secrets_client = boto3.client('secretsmanager')
+# FitCloud API 타임아웃 (연결, 읽기) - 연결 장애는 빠르게 실패시키고 조회 응답은 충분히 기다림
+# 읽기 타임아웃은 재시도하지 않으므로 응답 없는 호출은 읽기 타임아웃 한 번으로 끝나며,
+# 요청마다 남은 Lambda 실행 시간(여유분 제외)을 넘지 않도록 줄여서 사용하고, 그 안에 끝낼 수 없는 재시도는 하지 않음
+FITCLOUD_READ_TIMEOUT_SECONDS = float(os.environ.get('FITCLOUD_READ_TIMEOUT_SECONDS', '120'))
+FITCLOUD_TIMEOUT = (3.05, FITCLOUD_READ_TIMEOUT_SECONDS)
+LAMBDA_TIMEOUT_MARGIN_SECONDS = 2.0  # 오류 응답을 만들어 반환할 시간
+
+# Secrets Manager 클라이언트 초기화 (TCP keep-alive로 warm 컨테이너의 커넥션 유지, 짧은 타임아웃으로 장애 시 빠르게 실패)
+secrets_client = boto3.client('secretsmanager', config=Config(
+    tcp_keepalive=True,
+    connect_timeout=1,
+    read_timeout=2,
+    retries={'max_attempts': 2, 'mode': 'standard'}
+))
 
-# 토큰 캐싱을 위한 전역 변수
-FITCLOUD_API_TOKEN = None
+# AWS Parameters and Secrets Lambda Extension (레이어가 있으면 localhost 캐시에서 시크릿 조회, 없으면 Secrets Manager 직접 호출)
+SECRETS_EXTENSION_PORT = os.environ.get('PARAMETERS_SECRETS_EXTENSION_HTTP_PORT', '2773')
+SECRETS_EXT_URL = f"http://localhost:{SECRETS_EXTENSION_PORT}/secretsmanager/get?secretId={quote(SECRET_NAME, safe='')}"
+SECRETS_EXT_TIMEOUT = (0.2, 2)
+_SECRETS_EXT_SESSION = requests.Session()
+
+# 토큰 캐싱을 위한 전역 변수 (시크릿 로테이션을 반영하도록 TTL 적용)
+FITCLOUD_TOKEN_TTL_SECONDS = int(os.environ.get('FITCLOUD_TOKEN_TTL_SECONDS', '300'))
+_TOKEN_CACHE = {'value': None, 'expires_at': 0.0}
 
 # --- 최적화 관련 상수 설정 ---
 # MAX_RESPONSE_SIZE_BYTES = 10000 # 현재 코드에서 직접 사용되지 않음
 SUMMARY_ITEM_COUNT_THRESHOLD = 20  # 더 많은 항목을 허용
+DEBUG_BODY_LOG_MAX_BYTES = 100000  # 이보다 큰 API 응답은 DEBUG 로그에 본문 대신 크기만 기록
+
+# 시간대 객체는 콜드 스타트 시 한 번만 생성하여 재사용
+# 시스템 tzdata가 없는 최소 이미지에서는 고정 오프셋(UTC+9, 한국은 서머타임 없음)으로 대체
+try:
+    _KST = ZoneInfo('Asia/Seoul')
+except ZoneInfoNotFoundError:
+    _KST = timezone(timedelta(hours=9), 'KST')
+
+# 날짜 정보 캐시 (30초 단위 버킷) - 한 번의 요청 안에서 여러 번 호출되어도 계산은 한 번만 수행
+# lambda_handler 시작 시 비워서 warm 컨테이너에서도 호출마다 최신 날짜를 사용
+DATE_INFO_CACHE_SECONDS = 30
+_DATE_INFO_CACHE = {}
+
+# 현재 날짜 정보 (연/월/일 정수와 KST datetime)
+_DateInfo = namedtuple('_DateInfo', 'current_year current_month current_day current_datetime')
 
 def get_current_date_info():
     """현재 날짜 정보를 KST(한국 표준시) 기준으로 반환합니다."""
-    utc_now = datetime.utcnow()
-    tz = pytz.timezone('Asia/Seoul')
-    utc_with_tz = pytz.utc.localize(utc_now)
-    now = utc_with_tz.astimezone(tz)
-    
-    return {
-        'current_year': now.year,
-        'current_month': now.month,
-        'current_day': now.day,
-        'current_datetime': now,
-        'current_date_str': now.strftime('%Y%m%d'),
-        'current_month_str': now.strftime('%Y%m'),
-        'utc_time': utc_now.isoformat(),
-        'kst_time': now.isoformat()
-    }
+    key = int(time.time() // DATE_INFO_CACHE_SECONDS)
+    cached = _DATE_INFO_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    now = datetime.now(_KST)
+    date_info = _DateInfo(now.year, now.month, now.day, now)
+    # 이전 버킷은 제거하여 캐시가 커지지 않도록 유지
+    _DATE_INFO_CACHE.clear()
+    _DATE_INFO_CACHE[key] = date_info
+    return date_info
+
+def get_current_date_strings(date_info):
+    """날짜 정보에서 (YYYYMMDD, YYYYMM) 문자열을 필요할 때만 만듭니다."""
+    month_str = f"{date_info.current_year}{date_info.current_month:02d}"
+    return f"{month_str}{date_info.current_day:02d}", month_str
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _days_in_month(year, month):
+    """해당 월의 마지막 날짜(일수)를 반환합니다. (month는 1~12)"""
+    is_leap = (year % 4 == 0 and year % 100 != 0) or year % 400 == 0
+    return _DAYS_IN_MONTH[month - 1] + (month == 2 and is_leap)
+
+def _valid_yyyymmdd(value):
+    """YYYYMMDD 문자열이 실제 존재하는 날짜인지 strptime 없이 산술로 검사합니다."""
+    if len(value) != 8 or not value.isdigit():
+        return False
+    year, month, day = int(value[:4]), int(value[4:6]), int(value[6:8])
+    if not 1 <= month <= 12:
+        return False
+    return year >= 1 and 1 <= day <= _days_in_month(year, month)
+
+def _correct_month_only(value, current_year):
+    """월만 입력된 경우(예: '5', '05') → 현재 연도의 YYYYMM"""
+    return f"{current_year}{value.zfill(2)}"
+
+def _correct_mmdd(value, current_year):
+    """MMDD 형태(예: '0603') → 현재 연도의 YYYYMMDD"""
+    corrected_value = f"{current_year}{value}"
+    return corrected_value if _valid_yyyymmdd(corrected_value) else None
+
+def _correct_year(value, current_year):
+    """YYYYMMDD 또는 YYYYMM 형식에서 연도 보정"""
+    year_int = int(value[:4])
+    # 현재 연도보다 5년 이상 과거인 경우에만 연도 보정
+    if not 2020 <= year_int < current_year - 5:
+        return None
+    corrected_value = f"{current_year}{value[4:]}"
+    if not _valid_yyyymmdd(corrected_value if len(corrected_value) == 8 else corrected_value + '01'):
+        return None
+    return corrected_value
+
+def _parse_yyyymmdd(value):
+    """YYYYMMDD 문자열을 date로 변환합니다. (strptime 대신 슬라이싱, 잘못된 값은 ValueError)"""
+    if len(value) != 8 or not value.isdigit():
+        raise ValueError(f"YYYYMMDD 형식이 아닙니다: {value}")
+    return date(int(value[:4]), int(value[4:6]), int(value[6:]))
+
+def _parse_yyyymm(value):
+    """YYYYMM 문자열을 해당 월 1일의 date로 변환합니다. (잘못된 값은 ValueError)"""
+    if len(value) != 6 or not value.isdigit():
+        raise ValueError(f"YYYYMM 형식이 아닙니다: {value}")
+    return date(int(value[:4]), int(value[4:]), 1)
+
+def _valid_yyyymm(value):
+    """YYYYMM 문자열이 실제 존재하는 월인지 검사합니다."""
+    if len(value) != 6 or not value.isdigit():
+        return False
+    return int(value[:4]) >= 1 and 1 <= int(value[4:]) <= 12
+
+def _is_future_month(year, month, current_year, current_month):
+    """현재 월보다 이후 월인지 확인합니다. (같은 연도의 과거 월은 허용)"""
+    return (year, month) > (current_year, current_month)
+
+# (길이, 숫자 여부) → 보정 함수
+_DATE_CORRECTORS = {
+    (1, True): _correct_month_only,
+    (1, False): _correct_month_only,
+    (2, True): _correct_month_only,
+    (4, True): _correct_mmdd,
+    (6, True): _correct_year,
+    (8, True): _correct_year,
+}
 
 def smart_date_correction(params):
     """
     사용자 의도에 맞게 날짜 파라미터를 보정합니다.
     """
     current_info = get_current_date_info()
-    current_year = current_info['current_year']
+    current_year = current_info.current_year
     
     corrected_params = params.copy()
     
     # 'from' 또는 'to' 파라미터가 없는 경우, 현재 날짜를 기본값으로 설정
     if 'from' not in corrected_params and 'to' not in corrected_params:
         if 'billingPeriod' in corrected_params:
-            print(f"📅 billingPeriod 존재: {corrected_params['billingPeriod']}")
+            logger.debug("📅 billingPeriod 존재: %s", corrected_params['billingPeriod'])
         else:
-            today_str = f"{current_year}{current_info['current_month']:02d}{current_info['current_day']:02d}"
+            today_str = f"{current_year}{current_info.current_month:02d}{current_info.current_day:02d}"
             corrected_params['from'] = today_str
             corrected_params['to'] = today_str
-            print(f"📅 기본값 설정: from={today_str}, to={today_str}")
+            logger.debug("📅 기본값 설정: from=%s, to=%s", today_str, today_str)
 
     for param_name in ['from', 'to']:
         original_value = str(corrected_params.get(param_name, ''))
@@ -67,43 +195,39 @@ def smart_date_correction(params):
         if not original_value.strip():
             continue
 
-        # 월만 입력된 경우(예: '5', '05')
-        if len(original_value) == 1 or (len(original_value) == 2 and original_value.isdigit()):
-            month_str = original_value.zfill(2)
-            yyyymm = f"{current_year}{month_str}"
-            corrected_params[param_name] = yyyymm
-            print(f"📅 {param_name} 보정: {original_value} → {yyyymm}")
+        handler = _DATE_CORRECTORS.get((len(original_value), original_value.isdigit()))
+        if handler is None:
             continue
+        corrected_value = handler(original_value, current_year)
+        if corrected_value is not None:
+            corrected_params[param_name] = corrected_value
+            logger.debug("📅 %s 보정: %s → %s", param_name, original_value, corrected_value)
 
-        # MMDD 형태 (예: '0603')
-        if len(original_value) == 4 and original_value.isdigit():
-            test_date_str = str(current_year) + original_value
-            try:
-                datetime.strptime(test_date_str, '%Y%m%d')
-                corrected_params[param_name] = test_date_str
-                print(f"📅 {param_name} 보정: {original_value} → {test_date_str}")
-                continue
-            except ValueError:
-                pass
+    return corrected_params
 
-        # YYYYMMDD 또는 YYYYMM 형식에서 연도 보정
-        if len(original_value) == 8 or len(original_value) == 6:
-            year_part = original_value[:4]
-            suffix_part = original_value[4:]
-            try:
-                # 현재 연도보다 5년 이상 과거인 경우에만 연도 보정
-                if int(year_part) < current_year - 5 and int(year_part) >= 2020:
-                    corrected_value = str(current_year) + suffix_part
-                    if len(corrected_value) == 8:
-                        datetime.strptime(corrected_value, '%Y%m%d')
-                    elif len(corrected_value) == 6:
-                        datetime.strptime(corrected_value + '01', '%Y%m%d')
-                    corrected_params[param_name] = corrected_value
-                    print(f"📅 {param_name} 연도 보정: {original_value} → {corrected_value}")
-            except ValueError:
-                pass
+# API 경로별 필수 파라미터 정의
+_API_REQUIREMENTS = {
+    # 람다1 (슈퍼바이저) - 비용 조회 API
+    '/costs/ondemand/corp/monthly': {'required': ('from', 'to'), 'format': 'YYYYMM'},
+    '/costs/ondemand/account/monthly': {'required': ('from', 'to', 'accountId'), 'format': 'YYYYMM'},
+    '/costs/ondemand/corp/daily': {'required': ('from', 'to'), 'format': 'YYYYMMDD'},
+    '/costs/ondemand/account/daily': {'required': ('from', 'to', 'accountId'), 'format': 'YYYYMMDD'},
 
-    return corrected_params
+    # 람다2 (에이전트2) - 청구서/사용량 API
+    '/invoice/corp/monthly': {'required': ('billingPeriod',), 'format': 'YYYYMM'},
+    '/invoice/account/monthly': {'required': ('billingPeriod',), 'format': 'YYYYMM'},
+    '/usage/ondemand/monthly': {'required': ('from', 'to'), 'format': 'YYYYMM'},
+    '/usage/ondemand/daily': {'required': ('from', 'to'), 'format': 'YYYYMMDD'},
+    '/usage/ondemand/tags': {'required': ('beginDate', 'endDate'), 'format': 'YYYYMMDD'},
+}
+# 기간 파라미터 검증 규칙: (시작 키, 종료 키, YYYYMM 허용 여부, 형식 오류 메시지)
+_DATE_RANGE_RULES = (
+    ('from', 'to', True, "날짜 형식이 올바르지 않습니다 (YYYYMM 또는 YYYYMMDD)."),
+    ('beginDate', 'endDate', False, "날짜 형식이 올바르지 않습니다 (YYYYMMDD)."),
+)
+# billingPeriod가 있으면 from/to 필수 체크를 생략하는 월별 비용 API
+_COSTS_MONTHLY_PATHS = frozenset(['/costs/ondemand/account/monthly', '/costs/ondemand/corp/monthly'])
+ACCOUNT_ID_RE = re.compile(r'^[0-9]{12}$')  # AWS 계정 ID (12자리 숫자)
 
 def validate_date_logic(params, api_path=None):
     """
@@ -111,40 +235,23 @@ def validate_date_logic(params, api_path=None):
     API 경로에 따라 필요한 파라미터를 정확히 검증합니다.
     """
     current_info = get_current_date_info()
-    current_date_only = current_info['current_datetime'].date() 
 
     warnings = []
     
-    # API 경로별 필수 파라미터 정의
-    api_requirements = {
-        # 람다1 (슈퍼바이저) - 비용 조회 API
-        '/costs/ondemand/corp/monthly': {'required': ['from', 'to'], 'format': 'YYYYMM'},
-        '/costs/ondemand/account/monthly': {'required': ['from', 'to', 'accountId'], 'format': 'YYYYMM'},
-        '/costs/ondemand/corp/daily': {'required': ['from', 'to'], 'format': 'YYYYMMDD'},
-        '/costs/ondemand/account/daily': {'required': ['from', 'to', 'accountId'], 'format': 'YYYYMMDD'},
-        
-        # 람다2 (에이전트2) - 청구서/사용량 API
-        '/invoice/corp/monthly': {'required': ['billingPeriod'], 'format': 'YYYYMM'},
-        '/invoice/account/monthly': {'required': ['billingPeriod'], 'format': 'YYYYMM'},
-        '/usage/ondemand/monthly': {'required': ['from', 'to'], 'format': 'YYYYMM'},
-        '/usage/ondemand/daily': {'required': ['from', 'to'], 'format': 'YYYYMMDD'},
-        '/usage/ondemand/tags': {'required': ['beginDate', 'endDate'], 'format': 'YYYYMMDD'},
-    }
-    
     # API 경로가 지정된 경우 해당 API의 필수 파라미터 검증
-    if api_path and api_path in api_requirements:
-        requirements = api_requirements[api_path]
+    if api_path and api_path in _API_REQUIREMENTS:
+        requirements = _API_REQUIREMENTS[api_path]
         required_params = requirements['required']
         expected_format = requirements['format']
 
         # billingPeriod가 있으면 from/to 필수 체크 생략
-        if api_path in ['/costs/ondemand/account/monthly', '/costs/ondemand/corp/monthly'] and 'billingPeriod' in params:
+        if api_path in _COSTS_MONTHLY_PATHS and 'billingPeriod' in params:
             required_params = [p for p in required_params if p not in ['from', 'to']]
 
         # 필수 파라미터 존재 여부 확인
         missing_params = []
         for param in required_params:
-            if param not in params or not str(params[param]).strip():
+            if params.get(param) is None:
                 missing_params.append(param)
         
         if missing_params:
@@ -155,8 +262,7 @@ def validate_date_logic(params, api_path=None):
         for param in required_params:
             param_value = str(params[param])
             if param == 'accountId':
-                import re
-                if not re.match(r'^[0-9]{12}$', param_value):
+                if not ACCOUNT_ID_RE.match(param_value):
                     warnings.append(f"'accountId' 파라미터는 12자리 숫자여야 합니다: {param_value}")
             elif expected_format == 'YYYYMM' and not (len(param_value) == 6 and param_value.isdigit()):
                 warnings.append(f"'{param}' 파라미터는 YYYYMM 형식(6자리 숫자)이어야 합니다: {param_value}")
@@ -168,138 +274,324 @@ def validate_date_logic(params, api_path=None):
         billing_period = str(params['billingPeriod'])
         if len(billing_period) == 6:  # YYYYMM 형식
             try:
-                year = int(billing_period[:4])
-                month = int(billing_period[4:])
-                current_year = current_info['current_year']
-                current_month = current_info['current_month']
-                
-                # 현재 월보다 이후 월만 미래로 간주 (같은 연도의 과거 월은 허용)
-                is_future_month = (year > current_year) or \
-                                (year == current_year and month > current_month)
-                
-                if is_future_month:
+                current_year = current_info.current_year
+                current_month = current_info.current_month
+                if _is_future_month(int(billing_period[:4]), int(billing_period[4:]), current_year, current_month):
                     warnings.append(f"요청하신 월이 미래입니다: {billing_period} (현재: {current_year}{current_month:02d})")
                     
             except ValueError as e:
                 warnings.append(f"billingPeriod 파싱 오류: {e}. 유효한 월 형식(YYYYMM)을 입력해주세요.")
     
-    # from/to 파라미터 검증 (비용/사용량 API용)
-    if 'from' in params and 'to' in params:
-        from_str = str(params['from'])
-        to_str = str(params['to'])
+    # 기간 파라미터 검증: from/to (비용/사용량 API), beginDate/endDate (태그별 사용량 API)
+    for start_key, end_key, allow_monthly, format_error in _DATE_RANGE_RULES:
+        if start_key not in params or end_key not in params:
+            continue
+        start_str = str(params[start_key])
+        end_str = str(params[end_key])
         
         try:
-            is_daily_format = False
-            from_dt_obj = None
-            to_dt_obj = None
-
-            if len(from_str) == 8 and len(to_str) == 8:  # YYYYMMDD 형식
-                from_dt_obj = datetime.strptime(from_str, '%Y%m%d').date()
-                to_dt_obj = datetime.strptime(to_str, '%Y%m%d').date()
+            if len(start_str) == 8 and len(end_str) == 8:  # YYYYMMDD 형식
+                if not (_valid_yyyymmdd(start_str) and _valid_yyyymmdd(end_str)):
+                    # 존재하지 않는 날짜는 파싱 함수로 구체적인 오류(ValueError)를 발생시킴
+                    _parse_yyyymmdd(start_str)
+                    _parse_yyyymmdd(end_str)
                 is_daily_format = True
-            elif len(from_str) == 6 and len(to_str) == 6:  # YYYYMM 형식
-                from_dt_obj = datetime.strptime(from_str + '01', '%Y%m%d').date()
-                # to_dt_obj는 해당 월의 마지막 날짜로 설정하여 비교
-                next_month = (datetime.strptime(to_str + '01', '%Y%m%d').replace(day=1) + timedelta(days=32)).replace(day=1)
-                to_dt_obj = (next_month - timedelta(days=1)).date()
+            elif allow_monthly and len(start_str) == 6 and len(end_str) == 6:  # YYYYMM 형식
+                if not (_valid_yyyymm(start_str) and _valid_yyyymm(end_str)):
+                    _parse_yyyymm(start_str)
+                    _parse_yyyymm(end_str)
+                is_daily_format = False
             else:
-                warnings.append("날짜 형식이 올바르지 않습니다 (YYYYMM 또는 YYYYMMDD).")
+                warnings.append(format_error)
                 return warnings
-            
+
+            # 고정 길이 숫자 문자열이므로 date 객체 없이 정수 비교로 충분
+            # (YYYYMM은 시작월 1일 ~ 종료월 말일 비교와 동일)
+            start_int = int(start_str)
+            end_int = int(end_str)
+
             # 조회 기간 시작일이 종료일보다 늦을 경우
-            if from_dt_obj > to_dt_obj:
+            if start_int > end_int:
                 warnings.append("조회 시작일이 종료일보다 늦습니다.")
 
-            # 미래 날짜/월 체크 (현재 날짜를 기준으로 판단)
+            # 미래 날짜/월 체크 (시작/종료 중 늦은 날짜만 확인하면 충분)
+            later_int = max(start_int, end_int)
+            current_year = current_info.current_year
+            current_month = current_info.current_month
             if is_daily_format:
-                # 시작 날짜 또는 종료 날짜가 오늘보다 미래인 경우
-                if from_dt_obj > current_date_only or to_dt_obj > current_date_only:
-                    warnings.append(f"요청하신 날짜가 미래입니다: {from_str} - {to_str}")
+                if later_int > (current_year * 100 + current_month) * 100 + current_info.current_day:
+                    warnings.append(f"요청하신 날짜가 미래입니다: {start_str} - {end_str}")
             else: # 월별
-                # 요청된 월의 연도와 월을 추출
-                req_from_year = int(from_str[:4])
-                req_from_month = int(from_str[4:])
-                req_to_year = int(to_str[:4])
-                req_to_month = int(to_str[4:])
-                
-                # 현재 연도와 월을 기준으로 미래인지 판단
-                current_year = current_info['current_year']
-                current_month = current_info['current_month']
-                
-                # 현재 월보다 이후 월만 미래로 간주 (같은 연도의 과거 월은 허용)
-                is_from_future_month = (req_from_year > current_year) or \
-                                     (req_from_year == current_year and req_from_month > current_month)
-                is_to_future_month = (req_to_year > current_year) or \
-                                   (req_to_year == current_year and req_to_month > current_month)
-                
-                # 미래 월인 경우에만 경고
-                if is_from_future_month or is_to_future_month:
-                    warnings.append(f"요청하신 월이 미래입니다: {from_str} - {to_str} (현재: {current_year}{current_month:02d})")
-                    
-        except ValueError as e:
-            warnings.append(f"날짜 파싱 오류: {e}. 유효한 날짜 형식을 입력해주세요.")
-    
-    # beginDate/endDate 파라미터 검증 (태그별 사용량 API용)
-    if 'beginDate' in params and 'endDate' in params:
-        begin_str = str(params['beginDate'])
-        end_str = str(params['endDate'])
-        
-        try:
-            if len(begin_str) == 8 and len(end_str) == 8:  # YYYYMMDD 형식
-                begin_dt_obj = datetime.strptime(begin_str, '%Y%m%d').date()
-                end_dt_obj = datetime.strptime(end_str, '%Y%m%d').date()
-                
-                # 조회 기간 시작일이 종료일보다 늦을 경우
-                if begin_dt_obj > end_dt_obj:
-                    warnings.append("조회 시작일이 종료일보다 늦습니다.")
-
-                # 시작 날짜 또는 종료 날짜가 오늘보다 미래인 경우
-                if begin_dt_obj > current_date_only or end_dt_obj > current_date_only:
-                    warnings.append(f"요청하신 날짜가 미래입니다: {begin_str} - {end_str}")
-            else:
-                warnings.append("날짜 형식이 올바르지 않습니다 (YYYYMMDD).")
-                return warnings
+                if later_int > current_year * 100 + current_month:
+                    warnings.append(f"요청하신 월이 미래입니다: {start_str} - {end_str} (현재: {current_year}{current_month:02d})")
                     
         except ValueError as e:
             warnings.append(f"날짜 파싱 오류: {e}. 유효한 날짜 형식을 입력해주세요.")
 
     if warnings:
-        print(f"⚠️ 날짜 검증 경고: {warnings}")
+        logger.debug("⚠️ 날짜 검증 경고: %s", warnings)
     
     return warnings
 
-def create_retry_session(retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504)):
+class DeadlineRetry(Retry):
+    """마감 시각 전에 다음 시도를 끝낼 수 없으면 재시도를 멈추는 Retry (재시도마다 타임아웃 전체를 다시 쓰지 않도록)"""
+    deadline = None  # time.monotonic() 기준 마감 시각 (None이면 제한 없음)
+    attempt_seconds = 0.0  # 한 번의 시도에 걸릴 수 있는 최대 시간 (연결 + 읽기 타임아웃)
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.deadline = self.deadline
+        retry.attempt_seconds = self.attempt_seconds
+        return retry
+
+    def with_deadline(self, deadline, attempt_seconds):
+        """같은 재시도 설정에 이번 요청의 마감 시각을 지정한 복사본을 반환합니다."""
+        retry = self.new()
+        retry.deadline = deadline
+        retry.attempt_seconds = attempt_seconds
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method=method, url=url, response=response, error=error, _pool=_pool, _stacktrace=_stacktrace)
+        if self.deadline is not None and time.monotonic() + retry.get_backoff_time() + self.attempt_seconds > self.deadline:
+            # 재시도 소진과 같게 처리 (raise_on_status=False이면 urllib3가 마지막 응답을 그대로 반환)
+            raise MaxRetryError(_pool, url, error or ResponseError(ResponseError.GENERIC_ERROR))
+        return retry
+
+def create_retry_session(retries=3, category_retries=2, backoff_factor=0.3, status_forcelist=(500, 502, 503),
+                         pool_connections=1, pool_maxsize=1):
     """재시도 로직이 포함된 requests 세션을 생성합니다."""
     session = requests.Session()
-    retry = Retry(
+    retry = DeadlineRetry(
+        # 전체 재시도 횟수로 상한을 두고, 연결/상태 코드별 재시도는 그보다 적게 제한
         total=retries,
-        read=retries,
-        connect=retries,
+        connect=category_retries,
+        # 읽기 타임아웃은 재시도하지 않음 (응답 없는 POST를 반복하면 최대 대기 시간이 읽기 타임아웃의 배수로 늘어남)
+        read=0,
+        status=category_retries,
         backoff_factor=backoff_factor,
+        # 504는 FitCloud 앞단에서 이미 시간 초과된 응답이므로 재시도 대상에서 제외 (다시 보내도 같은 시간만큼 기다리게 됨)
         status_forcelist=status_forcelist,
+        # FitCloud API는 모두 POST 조회 API이므로 POST도 재시도 대상에 포함 (기본값은 POST 제외)
+        allowed_methods=frozenset(['POST', 'GET']),
+        # Retry-After(예: 120초)를 따르면 Lambda가 타임아웃될 때까지 대기할 수 있으므로 짧은 백오프만 사용
+        respect_retry_after_header=False,
+        # 재시도 소진 시 예외 대신 마지막 응답을 반환 (호출부에서 상태 코드를 확인)
+        raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    # FitCloud 단일 호스트만 호출하고 Lambda는 한 번에 한 요청만 처리하므로 커넥션 하나면 충분
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
+    # 모든 요청에 공통인 헤더는 세션에 한 번만 설정 (keep-alive 명시, 요청 본문은 항상 form 인코딩)
+    session.headers.update({
+        'User-Agent': 'FitCloud-Lambda/1.0',
+        'Connection': 'keep-alive',
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'Accept': 'application/json',
+    })
     return session
 
-def get_fitcloud_token():
-    """Secrets Manager에서 FitCloud API 토큰을 가져옵니다."""
-    global FITCLOUD_API_TOKEN
-    if FITCLOUD_API_TOKEN is None:
-        try:
+# warm 컨테이너에서 keep-alive 커넥션을 재사용하도록 세션은 콜드 스타트 시 한 번만 생성
+_SESSION = create_retry_session()
+
+# API 경로별 요청 파라미터 명세: (필수, 선택, 우선순위 그룹)
+# 우선순위 그룹은 앞쪽 그룹의 파라미터가 하나라도 있으면 그 그룹만 전송
+_API_PARAM_SPEC = {
+    '/accounts': ((), (), ()),
+    '/costs/ondemand/corp/monthly': ((), ('from', 'to'), ()),
+    '/costs/ondemand/account/monthly': ((), ('from', 'to', 'accountId'), ()),
+    '/costs/ondemand/corp/daily': ((), ('accountId',), (('billingPeriod',), ('from', 'to'))),
+    '/costs/ondemand/account/daily': ((), ('accountId',), (('billingPeriod',), ('from', 'to'))),
+    '/invoice/corp/monthly': (('billingPeriod',), ('accountId',), ()),
+    '/invoice/account/monthly': (('billingPeriod',), ('accountId',), ()),
+    '/usage/ondemand/tags': ((), ('beginDate', 'endDate'), ()),
+    '/usage/ondemand/daily': (('from', 'to'), (), ()),
+    '/usage/ondemand/monthly': (('from', 'to'), (), ()),
+}
+# FitCloud 호출 예외 타입 → (HTTP 상태 코드, 오류 메시지 접두어)
+# ConnectTimeout은 ConnectionError와 Timeout을 모두 상속하므로 부모 타입보다 먼저 매칭되도록 직접 등록
+_API_ERROR_MAP = {
+    requests.exceptions.ConnectTimeout: (504, "FitCloud API 연결 시간 초과"),
+    requests.exceptions.ReadTimeout: (504, "FitCloud API 응답 시간 초과"),
+    requests.exceptions.Timeout: (504, "FitCloud API 응답 시간 초과"),
+    requests.exceptions.ConnectionError: (503, "FitCloud API 연결 오류"),
+}
+
+def classify_api_error(error):
+    """예외를 응답 상태 코드와 메시지 접두어로 변환합니다. (하위 예외 타입은 MRO 순서로 매칭)"""
+    # FitCloud가 오류 상태 코드로 응답한 경우 해당 상태 코드를 그대로 전달
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code, "FitCloud API 오류 응답"
+    # 재시도 소진 시 requests는 urllib3 MaxRetryError를 ConnectionError로 감싸므로 원인(reason)으로 타임아웃을 구분
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        reason = getattr(error.args[0], 'reason', None)
+        if isinstance(reason, ReadTimeoutError):
+            return _API_ERROR_MAP[requests.exceptions.ReadTimeout]
+        # NewConnectionError(연결 거부 등)는 ConnectTimeoutError를 상속하지만 타임아웃이 아님
+        if isinstance(reason, ConnectTimeoutError) and not isinstance(reason, NewConnectionError):
+            return _API_ERROR_MAP[requests.exceptions.ConnectTimeout]
+    for error_type in type(error).__mro__:
+        mapped = _API_ERROR_MAP.get(error_type)
+        if mapped is not None:
+            return mapped
+    return 500, "API 처리 중 오류"
+
+# FitCloud 조회 응답 캐시: (API 경로, 요청 본문) → (만료 시각, 응답 바이트)
+# 같은 기간을 반복해서 묻는 에이전트 대화에서 warm 컨테이너가 API 왕복을 생략하도록 함 (0이면 비활성화)
+# 이미 끝난 기간의 조회만 캐시하며, 오늘/이번 달이 포함된 조회와 계정 목록은 항상 새로 조회
+FITCLOUD_RESPONSE_CACHE_SECONDS = int(os.environ.get('FITCLOUD_RESPONSE_CACHE_SECONDS', '300'))
+RESPONSE_CACHE_MAX_ENTRIES = 32
+_RESPONSE_CACHE = {}
+
+def is_closed_period_request(api_data):
+    """요청 기간의 끝이 오늘(일별) 또는 이번 달(월별) 이전인지 확인합니다. (기간이 없으면 False)"""
+    end = api_data.get('to') or api_data.get('endDate') or api_data.get('billingPeriod')
+    if not end:
+        return False
+    end = str(end)
+    if not end.isdigit():
+        return False
+    today_str, month_str = get_current_date_strings(get_current_date_info())
+    if len(end) == 8:
+        return end < today_str
+    if len(end) == 6:
+        return end < month_str
+    return False
+
+def get_cached_response(cache_key):
+    """만료되지 않은 캐시 응답 바이트를 반환합니다. (없으면 None)"""
+    entry = _RESPONSE_CACHE.get(cache_key)
+    if entry is None:
+        return None
+    expires_at, content = entry
+    if time.time() >= expires_at:
+        del _RESPONSE_CACHE[cache_key]
+        return None
+    return content
+
+def store_cached_response(cache_key, content):
+    """응답 바이트를 TTL 동안 캐시합니다. (가득 차면 가장 오래된 항목부터 제거)"""
+    if FITCLOUD_RESPONSE_CACHE_SECONDS <= 0:
+        return
+    if cache_key not in _RESPONSE_CACHE and len(_RESPONSE_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+        _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)))
+    _RESPONSE_CACHE[cache_key] = (time.time() + FITCLOUD_RESPONSE_CACHE_SECONDS, content)
+
+# 경로별 전체 요청 URL (콜드 스타트 시 한 번만 생성)
+_API_URLS = {path: FITCLOUD_BASE_URL + path for path in _API_PARAM_SPEC}
+
+def _classify_response_kind(api_path):
+    """API 경로별 응답 처리 방식을 분류합니다."""
+    if api_path.startswith('/invoice/'):
+        return 'invoice'
+    if api_path == '/usage/ondemand/tags':
+        return 'usage_tag'
+    if api_path.startswith('/usage/ondemand/'):
+        return 'usage'
+    return 'costs'  # /accounts, /costs/ondemand/*
+
+# 경로별 응답 처리 방식 (요청마다 접두어 비교를 하지 않도록 미리 분류)
+_API_RESPONSE_KINDS = {path: _classify_response_kind(path) for path in _API_PARAM_SPEC}
+
+def check_and_prepare_data(params, required, optional=(), preferred_groups=()):
+    """
+    API 파라미터 명세에 따라 FitCloud 요청 데이터를 구성합니다.
+    필수 파라미터가 없으면 ValueError를 발생시킵니다.
+    """
+    # params는 normalize_params를 거쳐 값이 없는 키가 제거된 상태이므로 get 한 번으로 존재 여부와 값을 함께 확인
+    get = params.get
+    api_data = {}
+    for key in required:
+        value = get(key)
+        if value is None:
+            raise ValueError(f"필수 파라미터 누락: {key}")
+        api_data[key] = value
+    # 선택 그룹: 앞쪽 그룹의 파라미터가 있으면 그 그룹만 사용 (billingPeriod 우선, 없으면 from/to)
+    for group in preferred_groups:
+        present = {}
+        for key in group:
+            value = get(key)
+            if value is not None:
+                present[key] = value
+        if present:
+            api_data.update(present)
+            break
+    for key in optional:
+        value = get(key)
+        if value is not None:
+            api_data[key] = value
+    return api_data
+
+def get_secret_from_extension():
+    """Lambda Extension의 로컬 캐시에서 시크릿을 조회합니다. (레이어 미설치/응답 불가 시 None)"""
+    session_token = os.environ.get('AWS_SESSION_TOKEN')
+    if not session_token:
+        return None
+    try:
+        response = _SECRETS_EXT_SESSION.get(
+            SECRETS_EXT_URL,
+            headers={'X-Aws-Parameters-Secrets-Token': session_token},
+            timeout=SECRETS_EXT_TIMEOUT
+        )
+    except requests.exceptions.RequestException as e:
+        logger.debug("Secrets extension unavailable, falling back to Secrets Manager: %s", e)
+        return None
+    if response.status_code != 200:
+        logger.warning("⚠️ Secrets extension returned %s, falling back to Secrets Manager", response.status_code)
+        return None
+    # 잘리거나 JSON이 아닌 응답도 Secrets Manager 직접 조회로 대체
+    try:
+        secret_response = response.json()
+    except ValueError as e:
+        logger.warning("⚠️ Secrets extension returned an invalid body, falling back to Secrets Manager: %s", e)
+        return None
+    if not isinstance(secret_response, dict) or 'SecretString' not in secret_response:
+        logger.warning("⚠️ Secrets extension response has no SecretString, falling back to Secrets Manager")
+        return None
+    return secret_response
+
+def get_fitcloud_token(use_extension=True):
+    """
+    Secrets Manager에서 FitCloud API 토큰을 가져옵니다. (TTL 동안 캐시)
+    use_extension=False이면 Lambda Extension을 거치지 않고 Secrets Manager를 직접 호출합니다.
+    """
+    if _TOKEN_CACHE['value'] and time.time() < _TOKEN_CACHE['expires_at']:
+        return _TOKEN_CACHE['value']
+    try:
+        get_secret_value_response = get_secret_from_extension() if use_extension else None
+        if get_secret_value_response is None:
             get_secret_value_response = secrets_client.get_secret_value(SecretId=SECRET_NAME)
-            if 'SecretString' in get_secret_value_response:
-                secret = json.loads(get_secret_value_response['SecretString'])
-                FITCLOUD_API_TOKEN = secret.get('fitcloud_api_token')
-                if not FITCLOUD_API_TOKEN:
-                    raise ValueError(f"Secret '{SECRET_NAME}' does not contain 'fitcloud_api_token' key.")
-            else:
-                raise ValueError("Secret does not contain a SecretString.")
-        except Exception as e:
-            print(f"❌ Token retrieval failed: {e}")
-            raise RuntimeError(f"Failed to retrieve API token: {e}")
-    return FITCLOUD_API_TOKEN
+        if 'SecretString' in get_secret_value_response:
+            secret = json.loads(get_secret_value_response['SecretString'])
+            token = secret.get('fitcloud_api_token')
+            if not token:
+                raise ValueError(f"Secret '{SECRET_NAME}' does not contain 'fitcloud_api_token' key.")
+        else:
+            raise ValueError("Secret does not contain a SecretString.")
+    except Exception as e:
+        logger.error("❌ Token retrieval failed: %s", e)
+        raise RuntimeError(f"Failed to retrieve API token: {e}")
+    _TOKEN_CACHE['value'] = token
+    _TOKEN_CACHE['expires_at'] = time.time() + FITCLOUD_TOKEN_TTL_SECONDS
+    # 새 토큰은 공유 세션의 기본 헤더에 한 번만 반영
+    _SESSION.headers['Authorization'] = f'Bearer {token}'
+    return token
+
+# 콜드 스타트(init 단계)에서 토큰을 미리 가져와 첫 요청 지연을 줄임
+# Secrets Manager 일시 장애로 init이 중단되지 않도록 실패 시 첫 요청에서 다시 시도
+# init 단계에서는 Lambda Extension이 아직 요청을 받지 않으므로 Secrets Manager를 직접 호출
+try:
+    get_fitcloud_token(use_extension=False)
+except Exception as e:
+    logger.warning("⚠️ 토큰 사전 로드 실패 (첫 요청에서 재시도): %s", e)
+
+def get_response_header(raw_data):
+    """FitCloud 응답 header에서 (code, message)를 꺼냅니다. (header가 없으면 (None, ''))"""
+    header = raw_data.get('header')
+    if not header:
+        return None, ''
+    return header.get('code'), header.get('message', '')
 
 def process_fitcloud_response(response_data, api_path):
     """FitCloud API 응답을 처리합니다."""
@@ -313,9 +605,7 @@ def process_fitcloud_response(response_data, api_path):
     
     # 응답이 딕셔너리 형태일 경우 (header/body 구조)
     if isinstance(response_data, dict):
-        header = response_data.get('header', {})
-        code = header.get('code')
-        message = header.get('message', '')
+        code, message = get_response_header(response_data)
         body = response_data.get('body', []) # 데이터가 없으면 빈 리스트
 
         if code == 200:
@@ -374,86 +664,111 @@ def format_account_list(accounts):
     lines.append("특정 계정의 비용 정보나 사용량을 확인하고 싶으시면 언제든 말씀해 주세요!")
     return "\n".join(lines)
 
-def create_bedrock_response(event, status_code=200, response_data=None, error_message=None):
+# 응답 본문/sessionAttributes 직렬화 시 공백을 제거해 페이로드 크기를 줄임
+_JSON_SEPARATORS = (',', ':')
+
+def json_loads(data):
+    """JSON 문자열/바이트를 파싱합니다. (orjson이 있으면 orjson 사용)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj):
+    """공백 없는 UTF-8 JSON 문자열로 직렬화합니다. (orjson이 있으면 orjson 사용)"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=_JSON_SEPARATORS)
+
+def create_bedrock_response(event, status_code=200, response_data=None, error_message=None, with_content=False):
     """Bedrock Agent에 맞는 응답 형식을 생성합니다."""
     action_group = event.get('actionGroup', 'unknown')
     api_path_from_event = event.get('apiPath', '') 
     http_method = event.get('httpMethod', 'POST')
     
-    # 현재 날짜 정보를 sessionAttributes에 포함
-    current_date_info = get_current_date_info()
-    session_attributes = {
-        'current_year': str(current_date_info['current_year']),
-        'current_month': str(current_date_info['current_month']),
-        'current_day': str(current_date_info['current_day']),
-        'current_date': current_date_info['current_date_str'],
-        'current_month_str': current_date_info['current_month_str']
-    }
-    
-    # 계정 정보를 sessionAttributes에 추가 (계정 목록 조회 시)
-    if response_data and "accounts" in response_data:
-        accounts_info = []
-        for account in response_data["accounts"]:
-            accounts_info.append({
-                "accountName": account.get("accountName", "N/A"),
-                "accountId": account.get("accountId", "N/A")
-            })
-        session_attributes['available_accounts'] = json.dumps(accounts_info, ensure_ascii=False)
-        print(f"📋 계정 정보를 sessionAttributes에 추가: {len(accounts_info)}개 계정")
-    
     final_data = {}
 
     if error_message:
+        # 오류 응답에는 날짜 정보가 필요 없으므로 sessionAttributes를 비워서 반환
+        session_attributes = {}
         final_data = {
             "error": error_message,
             "success": False
         }
         status_code = 400 if status_code == 200 else status_code 
     else:
+        # 현재 날짜 정보를 sessionAttributes에 포함
+        current_date_info = get_current_date_info()
+        current_date_str, current_month_str = get_current_date_strings(current_date_info)
+        session_attributes = {
+            'current_year': str(current_date_info.current_year),
+            'current_month': str(current_date_info.current_month),
+            'current_day': str(current_date_info.current_day),
+            'current_date': current_date_str,
+            'current_month_str': current_month_str
+        }
+
         final_data["success"] = response_data.get("success", True)
         final_data["message"] = response_data.get("message", "조회가 완료되었습니다.")
         
         # 'accounts' 또는 'cost_items'가 직접 최상위 레벨에 오도록 처리 (Bedrock 응답 가이드라인에 맞춤)
         # 스키마의 AccountListResponse 및 CostSummaryResponse에 맞춰 필드 매핑
         if "accounts" in response_data:
+            # 응답용 계정 목록, sessionAttributes용 계정 정보, 활성 계정 수를 한 번의 순회로 계산
             clean_accounts = []
+            accounts_info = []
+            active_count = 0
             for account in response_data["accounts"]:
+                account_name = account.get("accountName", "N/A")
+                account_id = account.get("accountId", "N/A")
+                status = account.get("status", "N/A")
                 clean_accounts.append({
-                    "accountName": account.get("accountName", "N/A"),
-                    "accountId": account.get("accountId", "N/A"),
+                    "accountName": account_name,
+                    "accountId": account_id,
                     "email": account.get("email", "N/A"),
-                    "status": account.get("status", "N/A")
+                    "status": status
                 })
+                accounts_info.append({"accountName": account_name, "accountId": account_id})
+                if status == 'ACTIVE':
+                    active_count += 1
+            # 계정 정보를 sessionAttributes에 추가 (계정 목록 조회 시)
+            session_attributes['available_accounts'] = json_dumps(accounts_info)
+            logger.debug("📋 계정 정보를 sessionAttributes에 추가: %s개 계정", len(accounts_info))
             final_data["accounts"] = clean_accounts
             final_data["total_count"] = len(clean_accounts)
-            final_data["active_count"] = len([acc for acc in clean_accounts if acc.get('status') == 'ACTIVE'])
+            final_data["active_count"] = active_count
             # 자연어 message 추가 (예시2번 스타일)
             final_data["message"] = format_account_list(clean_accounts)
 
         elif "cost_items" in response_data:
             cost_items = []
-            total_cost_sum_usd = 0.0 # USD 기준 총합
+            costs_usd = [] # USD 기준 총합 계산용 (반올림 전 값)
             is_daily = response_data.get("cost_type") == "daily"
             is_account_level = response_data.get("scope") == "account"
+            date_key = 'dailyDate' if is_daily else 'monthlyDate'
+            # 반복문 안의 속성 조회를 줄이기 위해 로컬 이름으로 바인딩
+            append_item = cost_items.append
+            append_cost = costs_usd.append
             for item in response_data["cost_items"]:
+                get = item.get
                 try:
-                    cost_usd = float(item.get('usageFeeUSD', item.get('usageFee', 0.0)))
-                    cost_item = {
-                        "serviceName": item.get('serviceName', '알 수 없음'),
-                        "usageFeeUSD": round(cost_usd, 2)
-                    }
-                    if is_daily:
-                        cost_item["date"] = item.get('date') or item.get('dailyDate')
-                    else:
-                        cost_item["date"] = item.get('date') or item.get('monthlyDate')
-                    if is_account_level:
-                        cost_item["accountId"] = item.get('accountId', 'N/A')
-                        cost_item["accountName"] = item.get('accountName', '알 수 없음')
-                    cost_items.append(cost_item)
-                    total_cost_sum_usd += cost_usd
+                    fee = item['usageFeeUSD'] if 'usageFeeUSD' in item else get('usageFee', 0.0)
+                    # 이미 float인 경우 변환 생략
+                    cost_usd = fee if type(fee) is float else float(fee)
                 except (ValueError, TypeError) as e:
-                    print(f"데이터 처리 오류 (비용 항목 스킵): {item} - {e}")
+                    logger.warning("데이터 처리 오류 (비용 항목 스킵): %s - %s", item, e)
                     continue
+                cost_item = {
+                    "serviceName": get('serviceName', '알 수 없음'),
+                    "usageFeeUSD": round(cost_usd, 2),
+                    "date": get('date') or get(date_key)
+                }
+                if is_account_level:
+                    cost_item["accountId"] = get('accountId', 'N/A')
+                    cost_item["accountName"] = get('accountName', '알 수 없음')
+                append_item(cost_item)
+                append_cost(cost_usd)
+            # 항목 수가 많아도 누적 오차가 없도록 fsum으로 합산
+            total_cost_sum_usd = fsum(costs_usd)
             final_data["cost_type"] = response_data.get("cost_type")
             final_data["scope"] = response_data.get("scope")
             final_data["cost_items"] = cost_items
@@ -483,7 +798,7 @@ def create_bedrock_response(event, status_code=200, response_data=None, error_me
 
     # 최종 message 필드 로그로 남기기
     if "message" in final_data:
-        print(f"[RESPONSE][message] {final_data['message']}")
+        logger.debug("[RESPONSE][message] %s", final_data['message'])
 
     # === sessionAttributes에 표/요금 데이터와 메시지 추가 ===
     # 기존 sessionAttributes 불러오기
@@ -499,24 +814,35 @@ def create_bedrock_response(event, status_code=200, response_data=None, error_me
         last_cost_message = final_data.get("message")
     # sessionAttributes에 저장
     if last_cost_table is not None:
-        session_attributes["last_cost_table"] = json.dumps(last_cost_table, ensure_ascii=False)
+        session_attributes["last_cost_table"] = json_dumps(last_cost_table)
     if last_cost_message is not None:
         session_attributes["last_cost_message"] = last_cost_message
 
     # AWS Bedrock Agent가 기대하는 응답 형식
+    response = {
+        "actionGroup": action_group,
+        "apiPath": api_path_from_event, 
+        "httpMethod": http_method,
+        "httpStatusCode": status_code,
+        "responseBody": {
+            "application/json": {
+                "body": json_dumps(final_data)
+            }
+        }
+    }
+    if with_content:
+        # Bedrock 표준 content 필드 추가 (직렬화한 body를 다시 파싱하지 않고 message를 바로 사용)
+        response["body"] = {
+            "content": [
+                {
+                    "type": "text",
+                    "text": final_data.get("message") or "조회 결과가 없습니다."
+                }
+            ]
+        }
     return {
         "messageVersion": "1.0",
-        "response": {
-            "actionGroup": action_group,
-            "apiPath": api_path_from_event, 
-            "httpMethod": http_method,
-            "httpStatusCode": status_code,
-            "responseBody": {
-                "application/json": {
-                    "body": json.dumps(final_data, ensure_ascii=False)
-                }
-            }
-        },
+        "response": response,
         "sessionAttributes": session_attributes
     }
 
@@ -528,12 +854,8 @@ def safe_float(val, default=0.0):
 
 def process_invoice_response(raw_data, billing_period, account_id=None):
     # 람다2의 invoice 응답 포맷을 참고하여 통합
-    header = raw_data.get('header', {})
-    code = header.get('code')
-    message = header.get('message', '')
-    body = raw_data.get('body', [])
-    if body is None:
-        body = []
+    code, message = get_response_header(raw_data)
+    body = raw_data.get('body') or []  # 키가 없거나 null이면 빈 리스트
     if code not in [200, 203, 204]:
         raise ValueError(f"FitCloud API error {code}: {message}")
     # accountId 필터링
@@ -565,46 +887,53 @@ def process_invoice_response(raw_data, billing_period, account_id=None):
         "item_count": len(invoice_items)
     }
 
+@lru_cache(maxsize=4096)
+def _parse_tags_json(tags_json):
+    """tagsJson 문자열을 파싱합니다. (같은 태그 조합이 여러 항목에 반복되므로 결과를 캐시)"""
+    # 캐시된 dict는 여러 항목이 공유하므로 읽기 전용으로만 사용해야 함
+    return json.loads(tags_json)
+
 def summarize_cost_items(cost_items, month_str, account_names=None):
     if not cost_items:
         return f"{month_str} 온디맨드 사용 데이터가 없습니다."
-    total = sum(item.get('usageFeeUSD', item.get('onDemandCost', 0.0)) for item in cost_items)
-    from collections import defaultdict
+    # 총합과 서비스별 합계를 한 번의 순회로 계산
+    total = 0.0
     service_sum = defaultdict(float)
     for item in cost_items:
         service = item.get('serviceName', '기타')
         val = item.get('usageFeeUSD', item.get('onDemandCost', 0.0))
         service_sum[service] += val
-    top_services = sorted(service_sum.items(), key=lambda x: abs(x[1]), reverse=True)[:8]
+        total += val
+    # 상위 N개만 필요하므로 전체 정렬 대신 heapq.nlargest 사용
+    top_services = heapq.nlargest(8, service_sum.items(), key=lambda x: abs(x[1]))
     etc = total - sum(x[1] for x in top_services)
-    msg = f":bar_chart: **{month_str} 총 사용량: ${total:,.2f}**\n"
-    msg += "**주요 서비스별 사용량:**\n"
+    parts = [f":bar_chart: **{month_str} 총 사용량: ${total:,.2f}**\n"]
+    parts.append("**주요 서비스별 사용량:**\n")
     for name, val in top_services:
         percent = val / total * 100 if total else 0
-        msg += f"- **{name}**: ${val:,.2f} ({percent:.1f}%)\n"
+        parts.append(f"- **{name}**: ${val:,.2f} ({percent:.1f}%)\n")
     if etc > 0:
-        msg += f"- **기타 서비스**: ${etc:,.2f} ({etc/total*100:.1f}%)\n"
-    msg += "**주요 특징:**\n"
+        parts.append(f"- **기타 서비스**: ${etc:,.2f} ({etc/total*100:.1f}%)\n")
+    parts.append("**주요 특징:**\n")
     if top_services:
-        msg += f"- {top_services[0][0]}가 전체 사용량의 {top_services[0][1]/total*100:.1f}% 차지\n"
+        parts.append(f"- {top_services[0][0]}가 전체 사용량의 {top_services[0][1]/total*100:.1f}% 차지\n")
     if account_names:
-        msg += f"- 전체 {len(account_names)}개 계정({', '.join(account_names)})의 통합 사용량\n"
-    msg += f"- 총 {len(cost_items)}개 비용 항목\n"
-    msg += "이는 할인이나 크레딧이 적용되기 전의 온디맨드 사용량입니다. 실제 청구 금액과는 차이가 있을 수 있습니다."
-    return msg
+        parts.append(f"- 전체 {len(account_names)}개 계정({', '.join(account_names)})의 통합 사용량\n")
+    parts.append(f"- 총 {len(cost_items)}개 비용 항목\n")
+    parts.append("이는 할인이나 크레딧이 적용되기 전의 온디맨드 사용량입니다. 실제 청구 금액과는 차이가 있을 수 있습니다.")
+    return ''.join(parts)
 
 def summarize_cost_items_table(cost_items, month_str, account_names=None, is_daily=False):
     if not cost_items:
         return f"{month_str} 온디맨드 사용 데이터가 없습니다."
-    from collections import defaultdict
-    msg = ""
+    parts = []
     # 월 정보가 YYYYMM이면 YYYY년 MM월로 포맷
     if len(month_str) == 6:
         month_fmt = f"{month_str[:4]}년 {int(month_str[4:]):02d}월"
     else:
         month_fmt = month_str
-    msg += f"\n*━━━━━━━━━━━━━━━━━━━━━━*\n"
-    msg += f"*📅 {month_fmt} AWS 법인 전체 요금*\n"
+    parts.append(f"\n*━━━━━━━━━━━━━━━━━━━━━━*\n")
+    parts.append(f"*📅 {month_fmt} AWS 법인 전체 요금*\n")
     if is_daily:
         # 일별 집계
         date_service_sum = defaultdict(lambda: defaultdict(float))
@@ -617,54 +946,54 @@ def summarize_cost_items_table(cost_items, month_str, account_names=None, is_dai
             date_total[date] += val
         for date in sorted(date_service_sum.keys()):
             total = date_total[date]
-            top_services = sorted(date_service_sum[date].items(), key=lambda x: abs(x[1]), reverse=True)[:8]
+            top_services = heapq.nlargest(8, date_service_sum[date].items(), key=lambda x: abs(x[1]))
             etc = total - sum(x[1] for x in top_services)
             # 날짜를 YYYY-MM-DD로 포맷
             date_fmt = date
             if len(date) == 8:
                 date_fmt = f"{date[:4]}-{date[4:6]}-{date[6:]}"
-            msg += f"\n#### {date_fmt} 일별 온디맨드 사용금액 상위 8개 서비스\n"
-            msg += "| 서비스명 | 금액(USD) | 비율(%) |\n|---|---:|---:|\n"
+            parts.append(f"\n#### {date_fmt} 일별 온디맨드 사용금액 상위 8개 서비스\n")
+            parts.append("| 서비스명 | 금액(USD) | 비율(%) |\n|---|---:|---:|\n")
             for name, val in top_services:
                 percent = val / total * 100 if total else 0
-                msg += f"| {name} | ${val:,.2f} | {percent:.1f}% |\n"
+                parts.append(f"| {name} | ${val:,.2f} | {percent:.1f}% |\n")
             if etc > 0:
-                msg += f"| 기타 | ${etc:,.2f} | {etc/total*100:.1f}% |\n"
-            msg += f"| **총합** | **${total:,.2f}** | 100% |\n"
+                parts.append(f"| 기타 | ${etc:,.2f} | {etc/total*100:.1f}% |\n")
+            parts.append(f"| **총합** | **${total:,.2f}** | 100% |\n")
     else:
         # 월별/기존 방식
-        total = sum(item.get('usageFeeUSD', item.get('onDemandCost', 0.0)) for item in cost_items)
+        total = 0.0
         service_sum = defaultdict(float)
         for item in cost_items:
             service = item.get('serviceName', '기타')
             val = item.get('usageFeeUSD', item.get('onDemandCost', 0.0))
             service_sum[service] += val
-        top_services = sorted(service_sum.items(), key=lambda x: abs(x[1]), reverse=True)[:8]
+            total += val
+        top_services = heapq.nlargest(8, service_sum.items(), key=lambda x: abs(x[1]))
         etc = total - sum(x[1] for x in top_services)
-        msg += f"\n:moneybag: *총 온디맨드 사용금액: ${total:,.2f}*\n"
-        msg += f"*주요 서비스별 사용금액 (상위 8개)*\n"
+        parts.append(f"\n:moneybag: *총 온디맨드 사용금액: ${total:,.2f}*\n")
+        parts.append(f"*주요 서비스별 사용금액 (상위 8개)*\n")
         for idx, (name, val) in enumerate(top_services, 1):
             percent = val / total * 100 if total else 0
-            msg += f"{idx}. *{name}*: 약 ${val:,.0f} ({percent:.1f}%)\n"
+            parts.append(f"{idx}. *{name}*: 약 ${val:,.0f} ({percent:.1f}%)\n")
         if etc > 0:
-            msg += f"- 기타 서비스: 약 ${etc:,.0f} ({etc/total*100:.1f}%)\n"
-        msg += "\n*━━━━━━━━━━━━━━━━━━━━━━*\n"
-        msg += ":bulb: *분석 포인트*\n"
+            parts.append(f"- 기타 서비스: 약 ${etc:,.0f} ({etc/total*100:.1f}%)\n")
+        parts.append("\n*━━━━━━━━━━━━━━━━━━━━━━*\n")
+        parts.append(":bulb: *분석 포인트*\n")
         if total > 0 and top_services:
-            msg += f"- *{top_services[0][0]}*가 전체 비용의 약 {top_services[0][1]/total*100:.1f}% 차지\n"
+            parts.append(f"- *{top_services[0][0]}*가 전체 비용의 약 {top_services[0][1]/total*100:.1f}% 차지\n")
         else:
-            msg += "- 전체 비용이 0이거나, 분석 가능한 데이터가 없습니다.\n"
+            parts.append("- 전체 비용이 0이거나, 분석 가능한 데이터가 없습니다.\n")
         if account_names:
-            msg += f"- 전체 {len(account_names)}개 계정({', '.join(account_names)})의 통합 사용량\n"
-        msg += f"- 총 {len(cost_items)}개 비용 항목\n"
-        msg += "이는 순수 온디맨드 사용금액 기준이며, 실제 청구 금액(인보이스)과는 차이가 있을 수 있습니다. :chart_with_upwards_trend:"
-    return msg
+            parts.append(f"- 전체 {len(account_names)}개 계정({', '.join(account_names)})의 통합 사용량\n")
+        parts.append(f"- 총 {len(cost_items)}개 비용 항목\n")
+        parts.append("이는 순수 온디맨드 사용금액 기준이며, 실제 청구 금액(인보이스)과는 차이가 있을 수 있습니다. :chart_with_upwards_trend:")
+    return ''.join(parts)
 
 def summarize_invoice_items(invoice_items, billing_period):
     if not invoice_items:
         return f"{billing_period[:4]}년 {int(billing_period[4:]):02d}월 청구 데이터가 없습니다."
     total = sum(item['usageFeeUSD'] for item in invoice_items)
-    from collections import defaultdict
     service_sum = defaultdict(float)
     for item in invoice_items:
         service = item.get('serviceName', '기타')
@@ -682,32 +1011,31 @@ def summarize_invoice_items(invoice_items, billing_period):
         y, m = billing_period.split('-')
         month_fmt = f"{y}년 {int(m):02d}월"
     
-    msg = f":bar_chart: **{month_fmt} 청구 총액: ${total:,.2f}**\n"
-    msg += "**모든 서비스별 청구 금액:**\n"
+    parts = [f":bar_chart: **{month_fmt} 청구 총액: ${total:,.2f}**\n"]
+    parts.append("**모든 서비스별 청구 금액:**\n")
     
     # 모든 서비스를 개별적으로 표시
     for i, (name, val) in enumerate(all_services, 1):
         percent = val / total * 100 if total else 0
-        msg += f"{i}. **{name}**: ${val:,.2f} ({percent:.1f}%)\n"
+        parts.append(f"{i}. **{name}**: ${val:,.2f} ({percent:.1f}%)\n")
     
-    msg += "**주요 특징:**\n"
+    parts.append("**주요 특징:**\n")
     if all_services:
-        msg += f"- {all_services[0][0]}가 전체 청구 금액의 {all_services[0][1]/total*100:.1f}% 차지\n"
-    msg += f"- 총 {len(invoice_items)}개 청구 항목\n"
-    msg += "이 금액은 실제 결제 금액 기준의 최종 청구 내역을 포함합니다. 할인, 크레딧, RI, SP 등 모든 내역이 반영되어 있습니다."
-    return msg
+        parts.append(f"- {all_services[0][0]}가 전체 청구 금액의 {all_services[0][1]/total*100:.1f}% 차지\n")
+    parts.append(f"- 총 {len(invoice_items)}개 청구 항목\n")
+    parts.append("이 금액은 실제 결제 금액 기준의 최종 청구 내역을 포함합니다. 할인, 크레딧, RI, SP 등 모든 내역이 반영되어 있습니다.")
+    return ''.join(parts)
 
 def summarize_tag_items_table(tag_items, begin_date, end_date):
     if not tag_items:
         return f"{begin_date}~{end_date} 태그별 온디맨드 사용 데이터가 없습니다."
-    from collections import defaultdict
     tag_sum = defaultdict(float)
     total = 0.0
     for item in tag_items:
         tags = item.get('tagsJson', {})
         if isinstance(tags, str):
             try:
-                tags = json.loads(tags)
+                tags = _parse_tags_json(tags)
             except Exception:
                 tags = {}
         # 대표 태그명: Project, Env, Owner 등 우선, 없으면 기타
@@ -715,66 +1043,51 @@ def summarize_tag_items_table(tag_items, begin_date, end_date):
         val = item.get('usageFeeUSD', item.get('onDemandCost', 0.0))
         tag_sum[tag_str] += val
         total += val
-    top_tags = sorted(tag_sum.items(), key=lambda x: abs(x[1]), reverse=True)[:10]
+    top_tags = heapq.nlargest(10, tag_sum.items(), key=lambda x: abs(x[1]))
     etc = total - sum(x[1] for x in top_tags)
-    msg = f"### {begin_date}~{end_date} 태그별 온디맨드 사용금액 상위 10개 태그\n"
-    msg += "| 태그 | 금액(USD) | 비율(%) |\n|---|---:|---:|\n"
+    parts = [f"### {begin_date}~{end_date} 태그별 온디맨드 사용금액 상위 10개 태그\n"]
+    parts.append("| 태그 | 금액(USD) | 비율(%) |\n|---|---:|---:|\n")
     for name, val in top_tags:
         percent = val / total * 100 if total else 0
-        msg += f"| {name} | ${val:,.2f} | {percent:.1f}% |\n"
+        parts.append(f"| {name} | ${val:,.2f} | {percent:.1f}% |\n")
     if etc > 0:
-        msg += f"| 기타 | ${etc:,.2f} | {etc/total*100:.1f}% |\n"
-    msg += f"| **총합** | **${total:,.2f}** | 100% |\n"
-    return msg
+        parts.append(f"| 기타 | ${etc:,.2f} | {etc/total*100:.1f}% |\n")
+    parts.append(f"| **총합** | **${total:,.2f}** | 100% |\n")
+    return ''.join(parts)
+
+# inputText 파싱용 정규식 (콜드 스타트 시 한 번만 컴파일)
+_ACCOUNT_NAME_RES = (
+    re.compile(r'([가-힣a-zA-Z0-9]+계정)'),  # 티켓계정, dev계정 등
+    re.compile(r'계정[:\s]*([가-힣a-zA-Z0-9]+)'),  # 계정: 티켓
+    re.compile(r'([가-힣a-zA-Z0-9]+)의'),  # 티켓의 인보이스
+)
+_DAY_RANGE_RE = re.compile(r'([0-9]{1,2})[일\.]?\s*~\s*([0-9]{1,2})[일\.]?')
+_MONTH_RE = re.compile(r'([0-9]{1,2})월')
+_YEAR_MONTH_RE = re.compile(r'(\d{4})년\s*(\d{1,2})월')  # 2025년 5월 형식
 
-def determine_api_path(params):
+# 값이 없는 것으로 간주하는 문자열 (소문자 비교)
+# 'null'은 포함하지 않음 - 명시적으로 잘못된 값(예: accountId='null')은 제거하지 않고 검증 단계에서 오류로 알림
+_MISSING = frozenset(('', 'none'))
+
+def normalize_params(params):
     """
-    파라미터 기반으로 올바른 API 경로 결정 (On-Demand 비용 조회용)
+    파라미터 값을 한 번만 정규화합니다.
+    문자열은 앞뒤 공백을 제거하고, 비어 있거나 'none'인 값은 파라미터 자체를 제거합니다.
     """
-    has_billing_period = 'billingPeriod' in params and params['billingPeriod'] and str(params['billingPeriod']).strip() != '' and str(params['billingPeriod']).strip().lower() != 'none'
-    has_account_id = 'accountId' in params and params['accountId'] and str(params['accountId']).strip() != '' and str(params['accountId']).strip().lower() != 'none'
-    
-    date_format = None
-    if 'from' in params and params['from']: 
-        from_param = str(params['from'])
-        if len(from_param) == 8:
-            date_format = 'daily'
-        elif len(from_param) == 6:
-            date_format = 'monthly'
-    
-    print(f"🔍 API 경로 결정: billingPeriod={has_billing_period}, accountId={has_account_id}, format={date_format}")
-    
-    if has_billing_period:
-        if has_account_id:
-            print(f"  → 계정별 월별 API")
-            return '/costs/ondemand/account/monthly'
-        else:
-            print(f"  → 법인 월별 API")
-            return '/costs/ondemand/corp/monthly'
-    
-    if has_account_id:
-        if date_format == 'daily':
-            return '/costs/ondemand/account/daily'
-        elif date_format == 'monthly':
-            return '/costs/ondemand/account/monthly'
-        else:
-            print(f"  → 계정별 일별 API (기본값)")
-            return '/costs/ondemand/account/daily'
-    else:
-        if date_format == 'daily':
-            return '/costs/ondemand/corp/daily'
-        elif date_format == 'monthly':
-            return '/costs/ondemand/corp/monthly'
-        else:
-            print(f"  → 법인 일별 API (기본값)")
-            return '/costs/ondemand/corp/daily'
-
+    normalized = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if value.lower() in _MISSING:
+                continue
+        normalized[key] = value
+    return normalized
 
 def extract_parameters(event):
     """이벤트에서 파라미터를 추출합니다."""
     params = {}
-    session_current_year = None
-    session_current_month = None
     
     # Query Parameters (OpenAPI path parameters)
     if 'parameters' in event:
@@ -788,11 +1101,11 @@ def extract_parameters(event):
             body_content = content['application/x-www-form-urlencoded']
             if 'body' in body_content:
                 body_str = body_content['body']
-                from urllib.parse import parse_qs
-                parsed_body = parse_qs(body_str)
-                for key, value_list in parsed_body.items():
-                    if value_list:
-                        params[key] = value_list[0]
+                # 키별 값 리스트를 만들지 않고 한 번에 순회 (중복 키는 기존처럼 첫 값을 사용)
+                body_params = {}
+                for key, value in parse_qsl(body_str):
+                    body_params.setdefault(key, value)
+                params.update(body_params)
             elif 'properties' in body_content:
                 for prop_data in body_content['properties']:
                     params[prop_data['name']] = prop_data['value']
@@ -806,61 +1119,46 @@ def extract_parameters(event):
                     pass
     
     # 세션 속성에서 날짜 정보 가져오기
-    if 'sessionAttributes' in event:
-        session_attrs = event['sessionAttributes']
-        if 'current_year' in session_attrs:
-            session_current_year = str(session_attrs['current_year'])
-        if 'current_month' in session_attrs:
-            session_current_month = str(session_attrs['current_month']).zfill(2)
-    
-    # 현재 연도/월로 보정 (세션 연도가 잘못되어 있으면 현재 연도 사용)
-    current_info = get_current_date_info()
-    real_current_year = str(current_info['current_year'])
-    real_current_month = str(current_info['current_month']).zfill(2)
-    if not session_current_year or session_current_year != real_current_year:
-        session_current_year = real_current_year
-        print(f"📅 세션 연도 보정: {session_current_year} → {real_current_year}")
-    if not session_current_month or session_current_month != real_current_month:
-        session_current_month = real_current_month
-        print(f"📅 세션 월 보정: {session_current_month} → {real_current_month}")
+    session_attrs = event.get('sessionAttributes') or {}
+
+    # 날짜 보정에는 항상 현재(KST) 연도를 사용 (세션 연도가 다르면 현재 연도로 보정)
+    # 세션 월은 이후 보정에 쓰이지 않으므로 읽지 않음
+    session_current_year = str(get_current_date_info().current_year)
+    if 'current_year' in session_attrs and str(session_attrs['current_year']) != session_current_year:
+        logger.debug("📅 세션 연도 보정: %s → %s", session_attrs['current_year'], session_current_year)
     
     # inputText에서 월/일 정보 추출
     input_text = event.get('inputText', '')
-    import re
     
     # 계정명 추출 및 accountId 변환
-    account_name_patterns = [
-        r'([가-힣a-zA-Z0-9]+계정)',  # 티켓계정, dev계정 등
-        r'계정[:\s]*([가-힣a-zA-Z0-9]+)',  # 계정: 티켓
-        r'([가-힣a-zA-Z0-9]+)의',  # 티켓의 인보이스
-    ]
-    
     account_name = None
-    for pattern in account_name_patterns:
-        match = re.search(pattern, input_text)
+    for pattern in _ACCOUNT_NAME_RES:
+        match = pattern.search(input_text)
         if match:
             account_name = match.group(1)
-            print(f"📋 inputText에서 계정명 추출: {account_name}")
+            logger.debug("📋 inputText에서 계정명 추출: %s", account_name)
             break
     
     # 계정명이 있으면 sessionAttributes에서 계정 목록 확인
-    if account_name and 'sessionAttributes' in event:
-        session_attrs = event['sessionAttributes']
-        if 'available_accounts' in session_attrs:
-            try:
-                available_accounts = json.loads(session_attrs['available_accounts'])
-                for account in available_accounts:
-                    if account.get('accountName') == account_name:
-                        params['accountId'] = account.get('accountId')
-                        print(f"📋 계정명 '{account_name}'을 accountId '{params['accountId']}'로 변환")
-                        break
-            except Exception as e:
-                print(f"📋 계정 목록 파싱 실패: {e}")
+    if account_name and 'available_accounts' in session_attrs:
+        try:
+            available_accounts = json.loads(session_attrs['available_accounts'])
+            for account in available_accounts:
+                if account.get('accountName') == account_name:
+                    params['accountId'] = account.get('accountId')
+                    logger.debug("📋 계정명 '%s'을 accountId '%s'로 변환", account_name, params['accountId'])
+                    break
+        except Exception as e:
+            logger.warning("📋 계정 목록 파싱 실패: %s", e)
     
     # 일자 범위(1~5일 등) 추출
-    day_range_match = re.search(r'([0-9]{1,2})[일\.]?\s*~\s*([0-9]{1,2})[일\.]?', input_text)
-    month_match = re.search(r'([0-9]{1,2})월', input_text)
-    year_month_match = re.search(r'(\d{4})년\s*(\d{1,2})월', input_text)  # 2025년 5월 형식
+    # 날짜 패턴은 모두 숫자를 포함하므로 숫자가 없는 입력(파라미터만 전달된 호출 등)은 정규식 검색을 생략
+    if input_text and any(map(str.isdigit, input_text)):
+        day_range_match = _DAY_RANGE_RE.search(input_text)
+        month_match = _MONTH_RE.search(input_text)
+        year_month_match = _YEAR_MONTH_RE.search(input_text)
+    else:
+        day_range_match = month_match = year_month_match = None
     api_path = event.get('apiPath', '')
     
     if month_match and day_range_match:
@@ -873,11 +1171,11 @@ def extract_parameters(event):
         if api_path.startswith('/usage/ondemand/tags'):
             params['beginDate'] = yyyymmdd_from
             params['endDate'] = yyyymmdd_to
-            print(f"📅 inputText에서 태그 일자 범위 추출: beginDate={params['beginDate']}, endDate={params['endDate']}")
+            logger.debug("📅 inputText에서 태그 일자 범위 추출: beginDate=%s, endDate=%s", params['beginDate'], params['endDate'])
         else:
             params['from'] = yyyymmdd_from
             params['to'] = yyyymmdd_to
-            print(f"📅 inputText에서 일자 범위 추출: from={params['from']}, to={params['to']}")
+            logger.debug("📅 inputText에서 일자 범위 추출: from=%s, to=%s", params['from'], params['to'])
     elif year_month_match:
         # 2025년 5월 형식 처리
         year = year_month_match.group(1)
@@ -886,26 +1184,26 @@ def extract_parameters(event):
         if api_path.startswith('/costs/ondemand/') or api_path.startswith('/usage/ondemand/'):
             params['from'] = yyyymm
             params['to'] = yyyymm
-            print(f"📅 inputText에서 연월 추출(비용/온디맨드API): from={params['from']}, to={params['to']}")
+            logger.debug("📅 inputText에서 연월 추출(비용/온디맨드API): from=%s, to=%s", params['from'], params['to'])
         elif api_path.startswith('/invoice/'):
             params['billingPeriod'] = yyyymm
-            print(f"📅 inputText에서 연월 추출(인보이스API): billingPeriod={params['billingPeriod']}")
+            logger.debug("📅 inputText에서 연월 추출(인보이스API): billingPeriod=%s", params['billingPeriod'])
     elif month_match:
         month_str = month_match.group(1).zfill(2)
         if api_path.startswith('/costs/ondemand/') or api_path.startswith('/usage/ondemand/'):
             params['from'] = f"{session_current_year}{month_str}"
             params['to'] = f"{session_current_year}{month_str}"
-            print(f"📅 inputText에서 월 추출(비용/온디맨드API): from={params['from']}, to={params['to']}")
+            logger.debug("📅 inputText에서 월 추출(비용/온디맨드API): from=%s, to=%s", params['from'], params['to'])
         elif api_path.startswith('/invoice/'):
             params['billingPeriod'] = f"{session_current_year}{month_str}"
-            print(f"📅 inputText에서 월 추출(인보이스API): billingPeriod={params['billingPeriod']}")
+            logger.debug("📅 inputText에서 월 추출(인보이스API): billingPeriod=%s", params['billingPeriod'])
     # 월만 입력된 경우 보정
     for k, v in list(params.items()):
         if k in ['from', 'to', 'billingPeriod', 'beginDate', 'endDate']:
             v_str = str(v)
             if (len(v_str) == 1 or (len(v_str) == 2 and v_str.isdigit())) and session_current_year:
                 params[k] = f"{session_current_year}{v_str.zfill(2)}"
-                print(f"📅 월 보정: {k}={v} → {params[k]}")
+                logger.debug("📅 월 보정: %s=%s → %s", k, v, params[k])
     
     # billingPeriod 자동 생성
     if not params.get('billingPeriod') and params.get('from') and len(str(params['from'])) >= 6:
@@ -919,19 +1217,15 @@ def extract_parameters(event):
         if len(billing_period) == 6:  # YYYYMM 형식
             params['from'] = billing_period
             params['to'] = billing_period
-            print(f"📅 billingPeriod를 from/to로 변환: {billing_period} → from={params['from']}, to={params['to']}")
+            logger.debug("📅 billingPeriod를 from/to로 변환: %s → from=%s, to=%s", billing_period, params['from'], params['to'])
     
     return params
 
 # --- 주요 처리 함수들을 lambda_handler 위로 이동 ---
 
 def process_usage_response(raw_data, from_period, to_period, is_daily=False, is_tag=False):
-    header = raw_data.get('header', {})
-    code = header.get('code')
-    message = header.get('message', '')
-    body = raw_data.get('body', [])
-    if body is None:
-        body = []
+    code, message = get_response_header(raw_data)
+    body = raw_data.get('body') or []  # 키가 없거나 null이면 빈 리스트
     if code not in [200, 203, 204]:
         raise ValueError(f"FitCloud API error {code}: {message}")
     items = []
@@ -945,7 +1239,7 @@ def process_usage_response(raw_data, from_period, to_period, is_daily=False, is_
             parsed_tags_json = {}
             if 'tagsJson' in item and isinstance(item['tagsJson'], str):
                 try:
-                    parsed_tags_json = json.loads(item['tagsJson'])
+                    parsed_tags_json = _parse_tags_json(item['tagsJson'])
                 except Exception:
                     parsed_tags_json = {}
             elif 'tagsJson' in item and isinstance(item['tagsJson'], dict):
@@ -993,12 +1287,8 @@ def process_usage_response(raw_data, from_period, to_period, is_daily=False, is_
 
 def process_invoice_response(raw_data, billing_period, account_id=None):
     # 람다2의 invoice 응답 포맷을 참고하여 통합
-    header = raw_data.get('header', {})
-    code = header.get('code')
-    message = header.get('message', '')
-    body = raw_data.get('body', [])
-    if body is None:
-        body = []
+    code, message = get_response_header(raw_data)
+    body = raw_data.get('body') or []  # 키가 없거나 null이면 빈 리스트
     if code not in [200, 203, 204]:
         raise ValueError(f"FitCloud API error {code}: {message}")
     # accountId 필터링
@@ -1030,55 +1320,73 @@ def process_invoice_response(raw_data, billing_period, account_id=None):
         "item_count": len(invoice_items)
     }
 
+# 요청 분기용 특수 키워드 정의 (inputText는 소문자로 변환 후 비교)
+_USAGE_KEYWORDS = ('순수 온디맨드', '순수 사용량', '할인 미적용', 'ri/sp 제외', '원가 기준', '할인 금액이 포함되지 않은', '할인 전 금액', '정가 기준', 'pure usage')
+_INVOICE_KEYWORDS = ('청구서', 'invoice', '인보이스', '최종 청구 금액', '실제 결제 금액', '실제 지불 금액')
+_TAG_KEYWORDS = ('태그', 'tag')
+
+def get_request_timeout(context):
+    """남은 Lambda 실행 시간 안에 끝나도록 FitCloud 요청 타임아웃(연결, 읽기)을 계산합니다."""
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return FITCLOUD_TIMEOUT
+    connect_timeout, read_timeout = FITCLOUD_TIMEOUT
+    remaining = context.get_remaining_time_in_millis() / 1000 - LAMBDA_TIMEOUT_MARGIN_SECONDS - connect_timeout
+    return connect_timeout, max(1.0, min(read_timeout, remaining))
+
+def get_request_deadline(context):
+    """재시도를 포함한 FitCloud 호출이 끝나야 하는 시각(time.monotonic 기준)을 반환합니다. (context가 없으면 None)"""
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return None
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000 - LAMBDA_TIMEOUT_MARGIN_SECONDS
+
 def lambda_handler(event, context):
-    print(f"🚀 통합 Lambda 시작: {event.get('apiPath', 'N/A')}")
-    print(f"[DEBUG] Raw event: {json.dumps(event, ensure_ascii=False)[:1000]}")
-    
-    # === conversationHistory와 sessionAttributes 디버깅 로그 추가 ===
-    print(f"[DEBUG][Agent1] conversationHistory 존재 여부: {'conversationHistory' in event}")
-    if 'conversationHistory' in event:
-        conversation_history = event['conversationHistory']
-        print(f"[DEBUG][Agent1] conversationHistory 타입: {type(conversation_history)}")
-        print(f"[DEBUG][Agent1] conversationHistory 내용: {json.dumps(conversation_history, ensure_ascii=False)[:500]}")
-        if isinstance(conversation_history, dict) and 'messages' in conversation_history:
-            print(f"[DEBUG][Agent1] conversationHistory 메시지 수: {len(conversation_history['messages'])}")
-            for i, msg in enumerate(conversation_history['messages']):
-                print(f"[DEBUG][Agent1] 메시지 {i}: role={msg.get('role')}, content 길이={len(str(msg.get('content', '')))}")
-    else:
-        print(f"[DEBUG][Agent1] conversationHistory가 event에 없습니다.")
-    
-    print(f"[DEBUG][Agent1] sessionAttributes 존재 여부: {'sessionAttributes' in event}")
-    if 'sessionAttributes' in event:
-        session_attrs = event['sessionAttributes']
-        print(f"[DEBUG][Agent1] sessionAttributes 타입: {type(session_attrs)}")
-        print(f"[DEBUG][Agent1] sessionAttributes 키 목록: {list(session_attrs.keys())}")
-        print(f"[DEBUG][Agent1] sessionAttributes 내용: {json.dumps(session_attrs, ensure_ascii=False)[:500]}")
-    else:
-        print(f"[DEBUG][Agent1] sessionAttributes가 event에 없습니다.")
+    api_path_from_event = event.get('apiPath', '')
+    logger.info("🚀 통합 Lambda 시작: %s", api_path_from_event or 'N/A')
+    # 호출마다 날짜 정보를 새로 계산하고, 호출 내부의 반복 조회만 캐시로 재사용
+    _DATE_INFO_CACHE.clear()
     
-    # sessionAttributes 값 로그로 출력
-    if 'sessionAttributes' in event:
-        print(f"[DEBUG][lambda] 전달받은 sessionAttributes: {json.dumps(event['sessionAttributes'], ensure_ascii=False)}")
+    # === 원본 이벤트, conversationHistory와 sessionAttributes 디버깅 로그 ===
+    # DEBUG 레벨일 때만 수행 (직렬화 비용이 크므로)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[DEBUG] Raw event: %s", json_dumps(event)[:1000])
+        logger.debug("[DEBUG][Agent1] conversationHistory 존재 여부: %s", 'conversationHistory' in event)
+        if 'conversationHistory' in event:
+            conversation_history = event['conversationHistory']
+            logger.debug("[DEBUG][Agent1] conversationHistory 타입: %s", type(conversation_history))
+            logger.debug("[DEBUG][Agent1] conversationHistory 내용: %s", json_dumps(conversation_history)[:500])
+            if isinstance(conversation_history, dict) and 'messages' in conversation_history:
+                logger.debug("[DEBUG][Agent1] conversationHistory 메시지 수: %s", len(conversation_history['messages']))
+                for i, msg in enumerate(conversation_history['messages']):
+                    logger.debug("[DEBUG][Agent1] 메시지 %s: role=%s, content 길이=%s", i, msg.get('role'), len(str(msg.get('content', ''))))
+        else:
+            logger.debug("[DEBUG][Agent1] conversationHistory가 event에 없습니다.")
+
+        logger.debug("[DEBUG][Agent1] sessionAttributes 존재 여부: %s", 'sessionAttributes' in event)
+        if 'sessionAttributes' in event:
+            session_attrs = event['sessionAttributes']
+            logger.debug("[DEBUG][Agent1] sessionAttributes 타입: %s", type(session_attrs))
+            logger.debug("[DEBUG][Agent1] sessionAttributes 키 목록: %s", list(session_attrs.keys()))
+            logger.debug("[DEBUG][Agent1] sessionAttributes 내용: %s", json_dumps(session_attrs)[:500])
+        else:
+            logger.debug("[DEBUG][Agent1] sessionAttributes가 event에 없습니다.")
+
+        # sessionAttributes 값 로그로 출력
+        if 'sessionAttributes' in event:
+            logger.debug("[DEBUG][lambda] 전달받은 sessionAttributes: %s", json_dumps(event['sessionAttributes']))
 
     # 1. 파라미터 추출 및 보정
-    params = extract_parameters(event)
-    print(f"[DEBUG] 추출된 파라미터: {params}")
+    params = normalize_params(extract_parameters(event))
+    logger.debug("[DEBUG] 추출된 파라미터: %s", params)
     params = smart_date_correction(params)
-    print(f"[DEBUG] 보정된 파라미터: {params}")
+    logger.debug("[DEBUG] 보정된 파라미터: %s", params)
     input_text = event.get('inputText', '').lower()
-    api_path_from_event = event.get('apiPath', '')
 
     # --- 분기 로직 개선 시작 ---
-    # 특수 키워드 정의
-    usage_keywords = ['순수 온디맨드', '순수 사용량', '할인 미적용', 'ri/sp 제외', '원가 기준', '할인 금액이 포함되지 않은', '할인 전 금액', '정가 기준', 'pure usage']
-    invoice_keywords = ['청구서', 'invoice', '인보이스', '최종 청구 금액', '실제 결제 금액', '실제 지불 금액']
-    tag_keywords = ['태그', 'tag']
-    
     # 키워드 판별
-    is_usage_request = any(k in input_text for k in usage_keywords)
-    is_invoice_request = any(k in input_text for k in invoice_keywords)
-    is_tag_usage = any(k in input_text for k in tag_keywords)
-    has_account_id = 'accountId' in params and params['accountId']
+    is_usage_request = any(k in input_text for k in _USAGE_KEYWORDS)
+    is_invoice_request = any(k in input_text for k in _INVOICE_KEYWORDS)
+    is_tag_usage = any(k in input_text for k in _TAG_KEYWORDS)
+    has_account_id = params.get('accountId') is not None
     from_str = str(params.get('from', ''))
     to_str = str(params.get('to', ''))
     is_daily = len(from_str) == 8 and from_str.isdigit() and len(to_str) == 8 and to_str.isdigit()
@@ -1087,14 +1395,14 @@ def lambda_handler(event, context):
     # API 경로 우선순위: 실제 요청 내용 > event의 apiPath
     # event의 apiPath가 /accounts이지만 실제 요청이 인보이스인 경우 인보이스 API로 분기
     if api_path_from_event == '/accounts' and (is_invoice_request or is_usage_request or is_tag_usage):
-        print(f"[DEBUG] API 경로가 /accounts이지만 실제 요청에 따라 다른 API로 분기")
+        logger.debug("[DEBUG] API 경로가 /accounts이지만 실제 요청에 따라 다른 API로 분기")
         api_path_from_event = ''  # API 경로 무시하고 실제 요청에 따라 분기
     
     # 태그별 usage API
     if 'beginDate' in params and 'endDate' in params:
         target_api_path = '/usage/ondemand/tags'
         api_type = 'usage_tag'
-        print(f"[DEBUG] 태그 API 분기: {target_api_path}")
+        logger.debug("[DEBUG] 태그 API 분기: %s", target_api_path)
     elif is_invoice_request:
         if has_account_id:
             target_api_path = '/invoice/account/monthly'
@@ -1102,11 +1410,11 @@ def lambda_handler(event, context):
         else:
             target_api_path = '/invoice/corp/monthly'
             api_type = 'invoice_corp'
-        print(f"[DEBUG] 인보이스 API 분기: {target_api_path}")
+        logger.debug("[DEBUG] 인보이스 API 분기: %s", target_api_path)
     elif is_usage_request:
         # usage API는 법인 전체만 지원, 계정별 요청 시 안내
         if has_account_id:
-            print(f"[ERROR] 순수 온디맨드/사용량은 법인 전체 기준만 지원. 계정별 요청 불가.")
+            logger.error("[ERROR] 순수 온디맨드/사용량은 법인 전체 기준만 지원. 계정별 요청 불가.")
             return create_bedrock_response(event, 400, error_message="순수 온디맨드/순수 사용량/할인 미적용 등은 법인 전체 기준만 지원합니다. 계정별로는 조회할 수 없습니다.")
         if is_daily:
             target_api_path = '/usage/ondemand/daily'
@@ -1118,12 +1426,12 @@ def lambda_handler(event, context):
             # 기본값: 월별
             target_api_path = '/usage/ondemand/monthly'
             api_type = 'usage_monthly'
-        print(f"[DEBUG] usage API 분기: {target_api_path}")
+        logger.debug("[DEBUG] usage API 분기: %s", target_api_path)
     elif api_path_from_event == '/accounts':
         # 계정 목록 조회
         target_api_path = '/accounts'
         api_type = 'accounts'
-        print(f"[DEBUG] 계정 목록 API 분기: {target_api_path}")
+        logger.debug("[DEBUG] 계정 목록 API 분기: %s", target_api_path)
     else:
         # 일반 비용/사용량(costs API)
         if is_daily:
@@ -1144,252 +1452,87 @@ def lambda_handler(event, context):
             # 기본값: 월별 법인
             target_api_path = '/costs/ondemand/corp/monthly'
             api_type = 'costs_monthly_corp'
-        print(f"[DEBUG] costs API 분기: {target_api_path}")
+        logger.debug("[DEBUG] costs API 분기: %s", target_api_path)
     # --- 분기 로직 개선 끝 ---
 
     # 4. 필수 파라미터 검증
     date_warnings = validate_date_logic(params, target_api_path)
-    print(f"[DEBUG] 날짜/파라미터 검증 결과: {date_warnings}")
+    logger.debug("[DEBUG] 날짜/파라미터 검증 결과: %s", date_warnings)
     if date_warnings:
-        print(f"[ERROR] 날짜/파라미터 검증 실패: {date_warnings}")
+        logger.error("[ERROR] 날짜/파라미터 검증 실패: %s", date_warnings)
         return create_bedrock_response(event, 400, error_message=f"날짜/파라미터 오류: {'; '.join(date_warnings)}. 유효한 값을 입력해주세요.")
 
     # 5. 토큰 및 세션 준비
+    # 토큰 갱신 시 Authorization 헤더는 공유 세션에 반영되므로 요청마다 headers를 만들지 않음
     try:
-        current_token = get_fitcloud_token()
+        get_fitcloud_token()
     except Exception as e:
-        print(f"[ERROR] 토큰 획득 실패: {e}")
+        logger.error("[ERROR] 토큰 획득 실패: %s", e)
         return create_bedrock_response(event, 401, error_message=f"FitCloud API 인증 실패: {str(e)}")
-    session = create_retry_session()
-    headers = {
-        'Authorization': f'Bearer {current_token}',
-        'User-Agent': 'FitCloud-Lambda/1.0'
-    }
+    session = _SESSION
 
     # 6. 실제 API 호출 및 응답 포맷 통합
+    param_spec = _API_PARAM_SPEC.get(target_api_path)
+    if param_spec is None:
+        logger.error("[ERROR] 지원하지 않는 API 경로: %s", target_api_path)
+        return create_bedrock_response(event, 404, error_message=f"지원하지 않는 API 경로: {target_api_path}")
+
     try:
-        if target_api_path == '/accounts':
-            url = f'{FITCLOUD_BASE_URL}/accounts'
-            print(f"[REQUEST] POST {url}")
-            print(f"[REQUEST] headers: {headers}")
-            response = session.post(url, headers=headers, timeout=120)
-            print(f"[RESPONSE] status_code: {response.status_code}")
-            print(f"[RESPONSE] body: {str(response.text)[:500]}")
-            raw_data = response.json()
-            processed_data_wrapper = process_fitcloud_response(raw_data, '/accounts')
-            bedrock_response = create_bedrock_response(event, 200, processed_data_wrapper)
-            # === Bedrock 표준 구조로 content 필드 추가 ===
-            # message 추출
-            message = None
-            if isinstance(bedrock_response, dict):
-                # responseBody.application/json.body에서 message 추출
-                try:
-                    body_json = bedrock_response.get("response", {}).get("responseBody", {}).get("application/json", {}).get("body")
-                    if body_json:
-                        body_data = json.loads(body_json)
-                        message = body_data.get("message")
-                except Exception:
-                    pass
-            if not message:
-                message = "조회 결과가 없습니다."
-            # Bedrock 표준 content 필드 추가
-            bedrock_response["response"]["body"] = {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": message
-                    }
-                ]
-            }
-            return bedrock_response
-
-        elif target_api_path.startswith('/costs/ondemand/'):
-            # 두 API는 반드시 from, to (account는 accountId도)로만 요청
-            if target_api_path in ['/costs/ondemand/corp/monthly', '/costs/ondemand/account/monthly']:
-                api_data = {}
-                if 'from' in params: api_data['from'] = params['from']
-                if 'to' in params: api_data['to'] = params['to']
-                if target_api_path == '/costs/ondemand/account/monthly' and 'accountId' in params:
-                    api_data['accountId'] = params['accountId']
-            else:
-                # 기존 로직 유지 (billingPeriod 우선, 없으면 from/to)
-                api_data = {}
-                if 'billingPeriod' in params:
-                    api_data['billingPeriod'] = params['billingPeriod']
+        api_data = check_and_prepare_data(params, *param_spec)
+
+        url = _API_URLS[target_api_path]
+        logger.debug("[REQUEST] POST %s", url)
+        logger.debug("[REQUEST] data: %s", api_data)
+        # form 본문을 직접 인코딩해 requests의 본문 타입 판별/인코딩 과정을 생략
+        body = urlencode(api_data).encode('ascii') if api_data else None
+        # 진행 중인 기간(오늘/이번 달)과 계정 목록은 값이 바뀔 수 있으므로 캐시하지 않음
+        is_cacheable = FITCLOUD_RESPONSE_CACHE_SECONDS > 0 and is_closed_period_request(api_data)
+        cache_key = (target_api_path, body)
+        content = get_cached_response(cache_key) if is_cacheable else None
+        is_cached = content is not None
+        if is_cached:
+            logger.debug("[RESPONSE] 캐시된 응답 사용: %s", target_api_path)
+        else:
+            timeout = get_request_timeout(context)
+            # 재시도까지 포함한 전체 호출이 남은 실행 시간 안에 끝나도록 이번 요청의 재시도 마감 시각을 지정
+            adapter = session.get_adapter(url)
+            adapter.max_retries = adapter.max_retries.with_deadline(get_request_deadline(context), sum(timeout))
+            response = session.post(url, data=body, timeout=timeout)
+            content = response.content
+            logger.debug("[RESPONSE] status_code: %s", response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                body_size = len(content)
+                if body_size <= DEBUG_BODY_LOG_MAX_BYTES:
+                    # 전체 본문을 디코딩하지 않고 원본 바이트에서 앞부분만 잘라서 로그
+                    logger.debug("[RESPONSE] body: %s", content[:500].decode('utf-8', 'replace'))
                 else:
-                    if 'from' in params: api_data['from'] = params['from']
-                    if 'to' in params: api_data['to'] = params['to']
-                if 'accountId' in params: api_data['accountId'] = params['accountId']
-            url = f'{FITCLOUD_BASE_URL}{target_api_path}'
-            print(f"[REQUEST] POST {url}")
-            print(f"[REQUEST] headers: {headers}")
-            print(f"[REQUEST] data: {api_data}")
-            response = session.post(url, headers=headers, data=api_data, timeout=120)
-            print(f"[RESPONSE] status_code: {response.status_code}")
-            print(f"[RESPONSE] body: {str(response.text)[:500]}")
-            raw_data = response.json()
-            processed_data_wrapper = process_fitcloud_response(raw_data, target_api_path)
-            bedrock_response = create_bedrock_response(event, 200, processed_data_wrapper)
-            # === Bedrock 표준 구조로 content 필드 추가 ===
-            # message 추출
-            message = None
-            if isinstance(bedrock_response, dict):
-                # responseBody.application/json.body에서 message 추출
-                try:
-                    body_json = bedrock_response.get("response", {}).get("responseBody", {}).get("application/json", {}).get("body")
-                    if body_json:
-                        body_data = json.loads(body_json)
-                        message = body_data.get("message")
-                except Exception:
-                    pass
-            if not message:
-                message = "조회 결과가 없습니다."
-            # Bedrock 표준 content 필드 추가
-            bedrock_response["response"]["body"] = {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": message
-                    }
-                ]
-            }
-            return bedrock_response
-
-        elif target_api_path.startswith('/invoice/'):
-            api_data = {'billingPeriod': params['billingPeriod']}
-            if 'accountId' in params and params['accountId']:
-                api_data['accountId'] = params['accountId']
-            url = f'{FITCLOUD_BASE_URL}{target_api_path}'
-            print(f"[REQUEST] POST {url}")
-            print(f"[REQUEST] headers: {headers}")
-            print(f"[REQUEST] data: {api_data}")
-            response = session.post(url, headers=headers, data=api_data, timeout=120)
-            print(f"[RESPONSE] status_code: {response.status_code}")
-            print(f"[RESPONSE] body: {str(response.text)[:500]}")
-            raw_data = response.json()
+                    logger.debug("[RESPONSE] body size: %d bytes (본문 로그 생략)", body_size)
+        try:
+            raw_data = json_loads(content)
+        except ValueError:
+            # FitCloud의 4xx는 header.message가 담긴 JSON이므로 아래 응답 처리에서 메시지를 전달하고,
+            # JSON이 아닌 오류 응답(HTML 오류 페이지 등)만 HTTP 오류로 처리
+            if not is_cached and response.status_code >= 400:
+                response.raise_for_status()
+            raise
+
+        response_kind = _API_RESPONSE_KINDS[target_api_path]
+        if response_kind == 'invoice':
             # 실제 API 요청에 사용한 billingPeriod를 우선적으로 전달
-            billing_period_used = api_data['billingPeriod']
-            processed_data_wrapper = process_invoice_response(raw_data, billing_period_used, params.get('accountId'))
-            bedrock_response = create_bedrock_response(event, 200, processed_data_wrapper)
-            # === Bedrock 표준 구조로 content 필드 추가 ===
-            # message 추출
-            message = None
-            if isinstance(bedrock_response, dict):
-                # responseBody.application/json.body에서 message 추출
-                try:
-                    body_json = bedrock_response.get("response", {}).get("responseBody", {}).get("application/json", {}).get("body")
-                    if body_json:
-                        body_data = json.loads(body_json)
-                        message = body_data.get("message")
-                except Exception:
-                    pass
-            if not message:
-                message = "조회 결과가 없습니다."
-            # Bedrock 표준 content 필드 추가
-            bedrock_response["response"]["body"] = {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": message
-                    }
-                ]
-            }
-            return bedrock_response
-
-        elif target_api_path == '/usage/ondemand/tags':
-            api_data = {}
-            if 'beginDate' in params: api_data['beginDate'] = params['beginDate']
-            if 'endDate' in params: api_data['endDate'] = params['endDate']
-            url = f'{FITCLOUD_BASE_URL}{target_api_path}'
-            print(f"[REQUEST] POST {url}")
-            print(f"[REQUEST] headers: {headers}")
-            print(f"[REQUEST] data: {api_data}")
-            response = session.post(url, headers=headers, data=api_data, timeout=120)
-            print(f"[RESPONSE] status_code: {response.status_code}")
-            print(f"[RESPONSE] body: {str(response.text)[:500]}")
-            raw_data = response.json()
+            processed_data_wrapper = process_invoice_response(raw_data, api_data['billingPeriod'], params.get('accountId'))
+        elif response_kind == 'usage_tag':
             processed_data_wrapper = process_usage_response(raw_data, params.get('beginDate'), params.get('endDate'), is_tag=True)
-            bedrock_response = create_bedrock_response(event, 200, processed_data_wrapper)
-            # === Bedrock 표준 구조로 content 필드 추가 ===
-            # message 추출
-            message = None
-            if isinstance(bedrock_response, dict):
-                # responseBody.application/json.body에서 message 추출
-                try:
-                    body_json = bedrock_response.get("response", {}).get("responseBody", {}).get("application/json", {}).get("body")
-                    if body_json:
-                        body_data = json.loads(body_json)
-                        message = body_data.get("message")
-                except Exception:
-                    pass
-            if not message:
-                message = "조회 결과가 없습니다."
-            # Bedrock 표준 content 필드 추가
-            bedrock_response["response"]["body"] = {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": message
-                    }
-                ]
-            }
-            return bedrock_response
-
-        elif target_api_path.startswith('/usage/ondemand/'):
-            if api_type == 'usage_daily':
-                api_data = {'from': params['from'], 'to': params['to']}
-                url = f'{FITCLOUD_BASE_URL}{target_api_path}'
-                print(f"[REQUEST] POST {url}")
-                print(f"[REQUEST] headers: {headers}")
-                print(f"[REQUEST] data: {api_data}")
-                response = session.post(url, headers=headers, data=api_data, timeout=120)
-                print(f"[RESPONSE] status_code: {response.status_code}")
-                print(f"[RESPONSE] body: {str(response.text)[:500]}")
-                raw_data = response.json()
-                processed_data_wrapper = process_usage_response(raw_data, params['from'], params['to'], is_daily=True)
-            else:
-                api_data = {'from': params['from'], 'to': params['to']}
-                url = f'{FITCLOUD_BASE_URL}{target_api_path}'
-                print(f"[REQUEST] POST {url}")
-                print(f"[REQUEST] headers: {headers}")
-                print(f"[REQUEST] data: {api_data}")
-                response = session.post(url, headers=headers, data=api_data, timeout=120)
-                print(f"[RESPONSE] status_code: {response.status_code}")
-                print(f"[RESPONSE] body: {str(response.text)[:500]}")
-                raw_data = response.json()
-                processed_data_wrapper = process_usage_response(raw_data, params['from'], params['to'])
-            bedrock_response = create_bedrock_response(event, 200, processed_data_wrapper)
-            # === Bedrock 표준 구조로 content 필드 추가 ===
-            # message 추출
-            message = None
-            if isinstance(bedrock_response, dict):
-                # responseBody.application/json.body에서 message 추출
-                try:
-                    body_json = bedrock_response.get("response", {}).get("responseBody", {}).get("application/json", {}).get("body")
-                    if body_json:
-                        body_data = json.loads(body_json)
-                        message = body_data.get("message")
-                except Exception:
-                    pass
-            if not message:
-                message = "조회 결과가 없습니다."
-            # Bedrock 표준 content 필드 추가
-            bedrock_response["response"]["body"] = {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": message
-                    }
-                ]
-            }
-            return bedrock_response
-
+        elif response_kind == 'usage':
+            processed_data_wrapper = process_usage_response(raw_data, params['from'], params['to'], is_daily=(api_type == 'usage_daily'))
         else:
-            print(f"[ERROR] 지원하지 않는 API 경로: {target_api_path}")
-            return create_bedrock_response(event, 404, error_message=f"지원하지 않는 API 경로: {target_api_path}")
+            processed_data_wrapper = process_fitcloud_response(raw_data, target_api_path)
+
+        # 정상 처리된 응답만 캐시 (오류 응답은 다음 요청에서 다시 조회)
+        if is_cacheable and not is_cached and response.status_code < 400:
+            store_cached_response(cache_key, content)
+        return create_bedrock_response(event, 200, processed_data_wrapper, with_content=True)
 
     except Exception as e:
-        import traceback
-        print(f"[ERROR] API 처리 중 예외: {e}")
-        print(traceback.format_exc())
-        return create_bedrock_response(event, 500, error_message=f"API 처리 중 오류: {str(e)}")
\ No newline at end of file
+        logger.error("[ERROR] API 처리 중 예외: %s", e, exc_info=True)
+        status_code, error_prefix = classify_api_error(e)
+        return create_bedrock_response(event, status_code, error_message=f"{error_prefix}: {str(e)}")
@@ -0,0 +1,500 @@
+import importlib.util
+import logging
+import os
+import time
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+requests = pytest.importorskip('requests')
+pytest.importorskip('boto3')
+
+from requests.packages.urllib3.exceptions import (
+    ConnectTimeoutError,
+    MaxRetryError,
+    NewConnectionError,
+    ReadTimeoutError,
+)
+from requests.packages.urllib3.response import HTTPResponse
+
+LAMBDA_PATH = os.path.join(os.path.dirname(__file__), '..', 'agent1-actions', 'fitcloudagent1_lambda.py')
+
+
+def _load_agent1():
+    """Secrets Manager 호출 없이 agent1 Lambda 모듈을 로드합니다."""
+    secrets_client = mock.Mock()
+    secrets_client.get_secret_value.return_value = {'SecretString': '{"fitcloud_api_token": "test-token"}'}
+    with mock.patch('boto3.client', return_value=secrets_client):
+        spec = importlib.util.spec_from_file_location('fitcloudagent1_lambda', LAMBDA_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module')
+def agent1():
+    return _load_agent1()
+
+
+def _freeze_today(agent1, monkeypatch, year, month, day):
+    """get_current_date_info가 지정한 KST 날짜를 반환하도록 고정합니다."""
+    now = datetime(year, month, day, 10, 0, tzinfo=agent1._KST)
+    date_info = agent1._DateInfo(year, month, day, now)
+    monkeypatch.setattr(agent1, 'get_current_date_info', lambda: date_info)
+
+
+def test_debug_log_level_does_not_enable_library_debug_logs():
+    root = logging.getLogger()
+    root_level = root.level
+    with mock.patch.dict(os.environ, {'LOG_LEVEL': 'DEBUG'}):
+        module = _load_agent1()
+    assert module.logger.isEnabledFor(logging.DEBUG)
+    assert root.level == root_level
+    assert not logging.getLogger('botocore').isEnabledFor(logging.DEBUG)
+    assert not logging.getLogger('urllib3').isEnabledFor(logging.DEBUG)
+
+
+def _retry_exhausted(reason):
+    """재시도 소진 시 requests가 던지는 ConnectionError(MaxRetryError(reason))를 만듭니다."""
+    return requests.exceptions.ConnectionError(MaxRetryError(None, '/accounts', reason=reason))
+
+
+def test_read_timeout_is_504(agent1):
+    assert agent1.classify_api_error(requests.exceptions.ReadTimeout()) == (504, "FitCloud API 응답 시간 초과")
+
+
+def test_connect_timeout_is_504(agent1):
+    assert agent1.classify_api_error(requests.exceptions.ConnectTimeout()) == (504, "FitCloud API 연결 시간 초과")
+
+
+def test_read_timeout_after_retries_is_504(agent1):
+    error = _retry_exhausted(ReadTimeoutError(None, '/accounts', 'Read timed out.'))
+    assert agent1.classify_api_error(error) == (504, "FitCloud API 응답 시간 초과")
+
+
+def test_connect_timeout_after_retries_is_504(agent1):
+    error = _retry_exhausted(ConnectTimeoutError(None, 'Connection timed out.'))
+    assert agent1.classify_api_error(error) == (504, "FitCloud API 연결 시간 초과")
+
+
+def test_connection_refused_is_503(agent1):
+    error = _retry_exhausted(NewConnectionError(None, 'Connection refused'))
+    assert agent1.classify_api_error(error) == (503, "FitCloud API 연결 오류")
+
+
+def test_http_error_keeps_upstream_status(agent1):
+    response = requests.Response()
+    response.status_code = 502
+    error = requests.exceptions.HTTPError(response=response)
+    assert agent1.classify_api_error(error) == (502, "FitCloud API 오류 응답")
+
+
+def test_other_errors_are_500(agent1):
+    assert agent1.classify_api_error(ValueError("bad json")) == (500, "API 처리 중 오류")
+
+
+@pytest.mark.parametrize('status, has_retry_after, expected', [
+    (500, False, True),
+    (502, False, True),
+    (503, False, True),
+    (503, True, True),
+    (504, False, False),
+    (429, True, False),
+    (400, False, False),
+])
+def test_session_retries_only_transient_5xx(agent1, status, has_retry_after, expected):
+    retry = agent1._SESSION.get_adapter('https://fitcloud.example').max_retries
+    assert retry.is_retry('POST', status, has_retry_after) is expected
+
+
+def test_session_ignores_retry_after(agent1):
+    retry = agent1._SESSION.get_adapter('https://fitcloud.example').max_retries
+    assert retry.respect_retry_after_header is False
+    assert retry.read == 0
+
+
+def _http_response(status_code, content):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+def _call_accounts(agent1, response):
+    event = {'apiPath': '/accounts', 'inputText': '계정 목록', 'parameters': []}
+    with mock.patch.object(agent1._SESSION, 'post', return_value=response):
+        result = agent1.lambda_handler(event, None)['response']
+    body = agent1.json_loads(result['responseBody']['application/json']['body'])
+    return result['httpStatusCode'], body
+
+
+def test_json_error_response_reports_fitcloud_message(agent1):
+    content = '{"header": {"code": 400, "message": "조회 기간은 최대 3개월입니다"}}'.encode('utf-8')
+    status_code, body = _call_accounts(agent1, _http_response(400, content))
+    assert status_code == 500
+    assert "조회 기간은 최대 3개월입니다" in body['error']
+
+
+def test_non_json_error_response_keeps_upstream_status(agent1):
+    status_code, body = _call_accounts(agent1, _http_response(503, b'<html>Service Unavailable</html>'))
+    assert status_code == 503
+    assert body['error'].startswith("FitCloud API 오류 응답")
+
+
+def _session_retry(agent1):
+    return agent1._SESSION.get_adapter('https://fitcloud.example').max_retries
+
+
+@pytest.mark.parametrize('seconds_left, attempt_seconds, retried', [
+    (60, 10, True),
+    (9.5, 10, False),
+    (-1, 0, False),
+])
+def test_retry_stops_when_next_attempt_cannot_finish(agent1, seconds_left, attempt_seconds, retried):
+    retry = _session_retry(agent1).with_deadline(time.monotonic() + seconds_left, attempt_seconds)
+    if retried:
+        next_retry = retry.increment('POST', '/accounts', response=HTTPResponse(status=503))
+        assert next_retry.deadline == retry.deadline
+        assert next_retry.attempt_seconds == attempt_seconds
+    else:
+        with pytest.raises(MaxRetryError):
+            retry.increment('POST', '/accounts', response=HTTPResponse(status=503))
+
+
+def test_retry_without_deadline_uses_retry_counts(agent1):
+    retry = _session_retry(agent1).with_deadline(None, 10)
+    for _ in range(2):
+        retry = retry.increment('POST', '/accounts', response=HTTPResponse(status=503))
+    with pytest.raises(MaxRetryError):
+        retry.increment('POST', '/accounts', response=HTTPResponse(status=503))
+
+
+class _LambdaContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+@pytest.mark.parametrize('remaining_ms, read_timeout', [
+    (900000, 120),
+    (30000, 30 - 2.0 - 3.05),
+    (3000, 1.0),
+])
+def test_request_timeout_fits_remaining_time(agent1, remaining_ms, read_timeout):
+    assert agent1.get_request_timeout(_LambdaContext(remaining_ms)) == pytest.approx((3.05, read_timeout))
+
+
+def test_request_deadline_without_context(agent1):
+    assert agent1.get_request_timeout(None) == agent1.FITCLOUD_TIMEOUT
+    assert agent1.get_request_deadline(None) is None
+    deadline = agent1.get_request_deadline(_LambdaContext(30000))
+    assert deadline == pytest.approx(time.monotonic() + 28, abs=1)
+
+
+@pytest.mark.parametrize('status_code, content, expected', [
+    (200, b'{"SecretString": "{\\"fitcloud_api_token\\": \\"ext-token\\"}"}',
+     {'SecretString': '{"fitcloud_api_token": "ext-token"}'}),
+    (200, b'{"SecretString": "{\\"fitcloud_api', None),
+    (200, b'<html>not json</html>', None),
+    (200, b'{"Name": "dev-FitCloud/ApiToken"}', None),
+    (200, b'[]', None),
+    (400, b'{"SecretString": "{}"}', None),
+])
+def test_secret_from_extension(agent1, monkeypatch, status_code, content, expected):
+    monkeypatch.setenv('AWS_SESSION_TOKEN', 'session-token')
+    with mock.patch.object(agent1._SECRETS_EXT_SESSION, 'get', return_value=_http_response(status_code, content)):
+        assert agent1.get_secret_from_extension() == expected
+
+
+def test_invalid_extension_body_falls_back_to_secrets_manager(agent1, monkeypatch):
+    monkeypatch.setenv('AWS_SESSION_TOKEN', 'session-token')
+    monkeypatch.setitem(agent1._TOKEN_CACHE, 'value', None)
+    monkeypatch.setitem(agent1._TOKEN_CACHE, 'expires_at', 0.0)
+    agent1.secrets_client.get_secret_value.return_value = {'SecretString': '{"fitcloud_api_token": "sm-token"}'}
+    with mock.patch.object(agent1._SECRETS_EXT_SESSION, 'get', return_value=_http_response(200, b'{"Secret')):
+        assert agent1.get_fitcloud_token() == 'sm-token'
+
+
+@pytest.mark.parametrize('params, expected', [
+    ({'from': ' 202405 ', 'to': '202406'}, {'from': '202405', 'to': '202406'}),
+    ({'accountId': 'None'}, {}),
+    ({'accountId': ' NONE '}, {}),
+    ({'accountId': ''}, {}),
+    ({'accountId': '   '}, {}),
+    ({'accountId': None}, {}),
+    ({'accountId': 'null'}, {'accountId': 'null'}),
+    ({'accountId': 'nonexistent'}, {'accountId': 'nonexistent'}),
+    ({'from': 202405}, {'from': 202405}),
+])
+def test_normalize_params(agent1, params, expected):
+    assert agent1.normalize_params(params) == expected
+
+
+def test_explicit_null_account_id_is_rejected(agent1):
+    event = {
+        'apiPath': '/costs/ondemand/corp/daily',
+        'inputText': '일별 비용',
+        'parameters': [
+            {'name': 'from', 'value': '20240501'},
+            {'name': 'to', 'value': '20240502'},
+            {'name': 'accountId', 'value': 'null'},
+        ],
+    }
+    with mock.patch.object(agent1._SESSION, 'post') as post:
+        result = agent1.lambda_handler(event, None)['response']
+    body = agent1.json_loads(result['responseBody']['application/json']['body'])
+    assert result['httpStatusCode'] == 400
+    assert "12자리 숫자여야 합니다" in body['error']
+    post.assert_not_called()
+
+
+# 기준일 2026-03-15 (KST)
+@pytest.mark.parametrize('params, expected', [
+    ({'from': '5', 'to': '05'}, {'from': '202605', 'to': '202605'}),
+    ({'from': '12', 'to': '12'}, {'from': '202612', 'to': '202612'}),
+    ({'from': '0301', 'to': '0315'}, {'from': '20260301', 'to': '20260315'}),
+    ({'from': '0229', 'to': '0231'}, {'from': '0229', 'to': '0231'}),
+    ({'from': '202003', 'to': '20200331'}, {'from': '202603', 'to': '20260331'}),
+    ({'from': '20200229', 'to': '20200430'}, {'from': '20200229', 'to': '20260430'}),
+    ({'from': '201903', 'to': '202103'}, {'from': '201903', 'to': '202103'}),
+    ({'from': '202501', 'to': '20251231'}, {'from': '202501', 'to': '20251231'}),
+    ({'from': '2025-05', 'to': '0'}, {'from': '2025-05', 'to': '202600'}),
+    ({}, {'from': '20260315', 'to': '20260315'}),
+    ({'billingPeriod': '202602'}, {'billingPeriod': '202602'}),
+    ({'to': '3'}, {'to': '202603'}),
+])
+def test_smart_date_correction(agent1, monkeypatch, params, expected):
+    _freeze_today(agent1, monkeypatch, 2026, 3, 15)
+    assert agent1.smart_date_correction(params) == expected
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('20240229', True),
+    ('20250229', False),
+    ('20260431', False),
+    ('20261231', True),
+    ('20261301', False),
+    ('20260100', False),
+    ('2026013', False),
+    ('2026O101', False),
+])
+def test_valid_yyyymmdd(agent1, value, expected):
+    assert agent1._valid_yyyymmdd(value) is expected
+
+
+@pytest.mark.parametrize('year, month, current_year, current_month, expected', [
+    (2026, 3, 2026, 3, False),
+    (2026, 4, 2026, 3, True),
+    (2026, 1, 2026, 3, False),
+    (2025, 12, 2026, 1, False),
+    (2027, 1, 2026, 12, True),
+])
+def test_is_future_month(agent1, year, month, current_year, current_month, expected):
+    assert agent1._is_future_month(year, month, current_year, current_month) is expected
+
+
+# (기준일, API 경로, 파라미터, 경고 목록)
+VALIDATION_CASES = [
+    ((2026, 3, 15), '/costs/ondemand/corp/monthly', {'from': '202601', 'to': '202603'}, []),
+    ((2026, 3, 15), '/costs/ondemand/corp/monthly', {'from': '202601', 'to': '202604'},
+     ["요청하신 월이 미래입니다: 202601 - 202604 (현재: 202603)"]),
+    ((2026, 3, 15), '/costs/ondemand/corp/daily', {'from': '20260301', 'to': '20260315'}, []),
+    ((2026, 3, 15), '/costs/ondemand/corp/daily', {'from': '20260301', 'to': '20260316'},
+     ["요청하신 날짜가 미래입니다: 20260301 - 20260316"]),
+    ((2026, 3, 15), '/costs/ondemand/corp/daily', {'from': '20260310', 'to': '20260301'},
+     ["조회 시작일이 종료일보다 늦습니다."]),
+    ((2026, 3, 15), '/costs/ondemand/corp/daily', {'from': '20260320', 'to': '20260301'},
+     ["조회 시작일이 종료일보다 늦습니다.", "요청하신 날짜가 미래입니다: 20260320 - 20260301"]),
+    ((2026, 3, 15), '/costs/ondemand/corp/daily', {'from': '20240201', 'to': '20240229'}, []),
+    ((2026, 3, 15), '/costs/ondemand/corp/daily', {'from': '20260301'}, ["필수 파라미터가 누락되었습니다: to"]),
+    ((2026, 3, 15), '/costs/ondemand/corp/daily', {'from': '202603', 'to': '20260315'},
+     ["'from' 파라미터는 YYYYMMDD 형식(8자리 숫자)이어야 합니다: 202603",
+      "날짜 형식이 올바르지 않습니다 (YYYYMM 또는 YYYYMMDD)."]),
+    ((2026, 3, 15), '/costs/ondemand/account/daily', {'from': '20260301', 'to': '20260302', 'accountId': '12345'},
+     ["'accountId' 파라미터는 12자리 숫자여야 합니다: 12345"]),
+    ((2026, 3, 15), '/costs/ondemand/account/daily', {'from': '20260301', 'to': '20260302', 'accountId': '123456789012'},
+     []),
+    ((2026, 3, 15), '/costs/ondemand/account/monthly', {'from': '202603', 'to': '202603'},
+     ["필수 파라미터가 누락되었습니다: accountId"]),
+    ((2026, 3, 15), '/costs/ondemand/corp/monthly', {'billingPeriod': '202604'},
+     ["요청하신 월이 미래입니다: 202604 (현재: 202603)"]),
+    ((2026, 3, 15), '/invoice/corp/monthly', {'billingPeriod': '202601'}, []),
+    ((2026, 3, 15), '/invoice/corp/monthly', {'billingPeriod': '202512'}, []),
+    ((2026, 3, 15), '/invoice/corp/monthly', {}, ["필수 파라미터가 누락되었습니다: billingPeriod"]),
+    ((2026, 3, 15), '/usage/ondemand/tags', {'beginDate': '20260301', 'endDate': '20260315'}, []),
+    ((2026, 3, 15), '/usage/ondemand/tags', {'beginDate': '202603', 'endDate': '202603'},
+     ["'beginDate' 파라미터는 YYYYMMDD 형식(8자리 숫자)이어야 합니다: 202603",
+      "'endDate' 파라미터는 YYYYMMDD 형식(8자리 숫자)이어야 합니다: 202603",
+      "날짜 형식이 올바르지 않습니다 (YYYYMMDD)."]),
+    ((2026, 3, 15), None, {'from': '202601', 'to': '202602'}, []),
+    # 연도가 바뀌는 날
+    ((2026, 1, 1), '/costs/ondemand/corp/monthly', {'from': '202512', 'to': '202601'}, []),
+    ((2026, 1, 1), '/costs/ondemand/corp/monthly', {'from': '202512', 'to': '202602'},
+     ["요청하신 월이 미래입니다: 202512 - 202602 (현재: 202601)"]),
+    ((2026, 1, 1), '/costs/ondemand/corp/daily', {'from': '20251231', 'to': '20260101'}, []),
+    ((2026, 1, 1), '/costs/ondemand/corp/daily', {'from': '20251231', 'to': '20260102'},
+     ["요청하신 날짜가 미래입니다: 20251231 - 20260102"]),
+    ((2025, 12, 31), '/invoice/corp/monthly', {'billingPeriod': '202601'},
+     ["요청하신 월이 미래입니다: 202601 (현재: 202512)"]),
+    # 월말
+    ((2026, 2, 28), '/costs/ondemand/corp/daily', {'from': '20260201', 'to': '20260228'}, []),
+    ((2026, 2, 28), '/costs/ondemand/corp/daily', {'from': '20260201', 'to': '20260301'},
+     ["요청하신 날짜가 미래입니다: 20260201 - 20260301"]),
+    ((2024, 2, 29), '/costs/ondemand/corp/daily', {'from': '20240229', 'to': '20240229'}, []),
+]
+
+
+@pytest.mark.parametrize('today, api_path, params, expected', VALIDATION_CASES)
+def test_validate_date_logic(agent1, monkeypatch, today, api_path, params, expected):
+    _freeze_today(agent1, monkeypatch, *today)
+    assert agent1.validate_date_logic(params, api_path) == expected
+
+
+@pytest.mark.parametrize('params', [
+    {'from': '20250201', 'to': '20250229'},
+    {'from': '20260431', 'to': '20260501'},
+    {'from': '20261301', 'to': '20261302'},
+    {'from': '202600', 'to': '202601'},
+    {'from': '202613', 'to': '202613'},
+])
+def test_validate_date_logic_rejects_nonexistent_dates(agent1, monkeypatch, params):
+    _freeze_today(agent1, monkeypatch, 2026, 3, 15)
+    warnings = agent1.validate_date_logic(params)
+    assert len(warnings) == 1
+    assert warnings[0].startswith("날짜 파싱 오류: ")
+
+
+# (API 경로, 정규화된 파라미터, FitCloud 요청 데이터)
+PREPARE_DATA_CASES = [
+    ('/accounts', {'from': '20260301'}, {}),
+    ('/costs/ondemand/corp/monthly', {'from': '202601', 'to': '202603'}, {'from': '202601', 'to': '202603'}),
+    ('/costs/ondemand/corp/monthly', {'from': '202601'}, {'from': '202601'}),
+    ('/costs/ondemand/account/monthly', {'from': '202601', 'to': '202603', 'accountId': '123456789012'},
+     {'from': '202601', 'to': '202603', 'accountId': '123456789012'}),
+    ('/costs/ondemand/corp/daily', {'from': '20260301', 'to': '20260315'}, {'from': '20260301', 'to': '20260315'}),
+    ('/costs/ondemand/corp/daily', {'billingPeriod': '202602', 'from': '20260301', 'to': '20260315'},
+     {'billingPeriod': '202602'}),
+    ('/costs/ondemand/account/daily', {'from': '20260301', 'to': '20260315', 'accountId': '123456789012'},
+     {'from': '20260301', 'to': '20260315', 'accountId': '123456789012'}),
+    ('/costs/ondemand/account/daily', {'billingPeriod': '202602', 'to': '20260315', 'accountId': '123456789012'},
+     {'billingPeriod': '202602', 'accountId': '123456789012'}),
+    ('/invoice/corp/monthly', {'billingPeriod': '202602', 'from': '20260301'}, {'billingPeriod': '202602'}),
+    ('/invoice/account/monthly', {'billingPeriod': '202602', 'accountId': '123456789012'},
+     {'billingPeriod': '202602', 'accountId': '123456789012'}),
+    ('/usage/ondemand/tags', {'beginDate': '20260301', 'endDate': '20260315', 'from': '20260301'},
+     {'beginDate': '20260301', 'endDate': '20260315'}),
+    ('/usage/ondemand/daily', {'from': '20260301', 'to': '20260315', 'accountId': '123456789012'},
+     {'from': '20260301', 'to': '20260315'}),
+    ('/usage/ondemand/monthly', {'from': '202601', 'to': '202603'}, {'from': '202601', 'to': '202603'}),
+]
+
+
+@pytest.mark.parametrize('api_path, params, expected', PREPARE_DATA_CASES)
+def test_check_and_prepare_data(agent1, api_path, params, expected):
+    api_data = agent1.check_and_prepare_data(params, *agent1._API_PARAM_SPEC[api_path])
+    assert api_data == expected
+    assert list(api_data) == list(expected)
+
+
+@pytest.mark.parametrize('api_path, params, missing', [
+    ('/invoice/corp/monthly', {'from': '202601'}, 'billingPeriod'),
+    ('/invoice/account/monthly', {'accountId': '123456789012'}, 'billingPeriod'),
+    ('/usage/ondemand/daily', {'from': '20260301'}, 'to'),
+    ('/usage/ondemand/monthly', {'to': '202603'}, 'from'),
+])
+def test_check_and_prepare_data_requires_parameters(agent1, api_path, params, missing):
+    with pytest.raises(ValueError, match=f"필수 파라미터 누락: {missing}"):
+        agent1.check_and_prepare_data(params, *agent1._API_PARAM_SPEC[api_path])
+
+
+def test_param_spec_covers_every_validated_path(agent1):
+    assert set(agent1._API_REQUIREMENTS) <= set(agent1._API_PARAM_SPEC)
+    assert set(agent1._API_URLS) == set(agent1._API_PARAM_SPEC)
+
+
+# 기준일 2026-03-15 (KST)
+@pytest.mark.parametrize('api_data, expected', [
+    ({'from': '20260301', 'to': '20260314'}, True),
+    ({'from': '20260301', 'to': '20260315'}, False),
+    ({'from': '20260301', 'to': '20260316'}, False),
+    ({'from': '202601', 'to': '202602'}, True),
+    ({'from': '202601', 'to': '202603'}, False),
+    ({'beginDate': '20260201', 'endDate': '20260228'}, True),
+    ({'beginDate': '20260301', 'endDate': '20260315'}, False),
+    ({'billingPeriod': '202602'}, True),
+    ({'billingPeriod': '202603'}, False),
+    ({'billingPeriod': '202512', 'accountId': '123456789012'}, True),
+    ({}, False),
+    ({'from': '20260101'}, False),
+    ({'to': '2026-02'}, False),
+    ({'to': '2026021'}, False),
+])
+def test_is_closed_period_request(agent1, monkeypatch, api_data, expected):
+    _freeze_today(agent1, monkeypatch, 2026, 3, 15)
+    assert agent1.is_closed_period_request(api_data) is expected
+
+
+@pytest.fixture
+def response_cache(agent1, monkeypatch):
+    """빈 응답 캐시와 조작 가능한 시계를 준비합니다."""
+    clock = {'now': 1000.0}
+    monkeypatch.setattr(agent1, '_RESPONSE_CACHE', {})
+    monkeypatch.setattr(agent1, 'FITCLOUD_RESPONSE_CACHE_SECONDS', 300)
+    monkeypatch.setattr(agent1.time, 'time', lambda: clock['now'])
+    return clock
+
+
+def test_cached_response_expires_after_ttl(agent1, response_cache):
+    agent1.store_cached_response('key', b'body')
+    response_cache['now'] += 299
+    assert agent1.get_cached_response('key') == b'body'
+    response_cache['now'] += 1
+    assert agent1.get_cached_response('key') is None
+    assert 'key' not in agent1._RESPONSE_CACHE
+
+
+def test_response_cache_evicts_oldest_entry(agent1, response_cache):
+    max_entries = agent1.RESPONSE_CACHE_MAX_ENTRIES
+    for i in range(max_entries):
+        agent1.store_cached_response(i, b'%d' % i)
+    agent1.store_cached_response(0, b'refreshed')
+    assert len(agent1._RESPONSE_CACHE) == max_entries
+    agent1.store_cached_response(max_entries, b'new')
+    assert len(agent1._RESPONSE_CACHE) == max_entries
+    assert agent1.get_cached_response(0) is None
+    assert agent1.get_cached_response(1) == b'1'
+    assert agent1.get_cached_response(max_entries) == b'new'
+
+
+def test_response_cache_disabled(agent1, response_cache, monkeypatch):
+    monkeypatch.setattr(agent1, 'FITCLOUD_RESPONSE_CACHE_SECONDS', 0)
+    agent1.store_cached_response('key', b'body')
+    assert agent1.get_cached_response('key') is None
+
+
+@pytest.mark.parametrize('params, cached', [
+    ({'from': '202601', 'to': '202602'}, True),
+    ({'from': '202602', 'to': '202603'}, False),
+])
+def test_handler_caches_only_closed_periods(agent1, monkeypatch, response_cache, params, cached):
+    _freeze_today(agent1, monkeypatch, 2026, 3, 15)
+    event = {
+        'apiPath': '/costs/ondemand/corp/monthly',
+        'inputText': '월별 비용',
+        'parameters': [{'name': name, 'value': value} for name, value in params.items()],
+    }
+    content = '{"header": {"code": 200, "message": "OK"}, "body": []}'.encode('utf-8')
+    with mock.patch.object(agent1._SESSION, 'post', return_value=_http_response(200, content)) as post:
+        for _ in range(2):
+            assert agent1.lambda_handler(event, None)['response']['httpStatusCode'] == 200
+    assert post.call_count == (1 if cached else 2)
+
+
+def test_handler_never_caches_accounts(agent1, response_cache):
+    content = b'[{"accountName": "A", "accountId": "123456789012", "status": "ACTIVE"}]'
+    for _ in range(2):
+        assert _call_accounts(agent1, _http_response(200, content))[0] == 200
+    assert agent1._RESPONSE_CACHE == {}